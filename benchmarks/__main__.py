@@ -0,0 +1,5 @@
+import sys
+
+from .hot_paths import main
+
+sys.exit(main())
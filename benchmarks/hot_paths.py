@@ -0,0 +1,312 @@
+"""Benchmarks dos caminhos quentes: indicador, montagem de dados e gráfico.
+
+Usa candles sintéticos (sem rede) em 1k, 100k e 10M barras (e 200) e mede cada
+variante do Hilo, a construção da figura e a montagem do DataFrame a partir
+das listas cruas do ccxt. Exemplos::
+
+    python -m benchmarks                          # roda e imprime a tabela
+    python -m benchmarks --save-baseline          # grava benchmarks/baseline.json
+    python -m benchmarks --check --threshold 0.25 # falha se algo ficou >25% mais lento
+"""
+import argparse
+import ast
+import functools
+import gc
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from hilo import Candles, HiloState, ReplayFeed, ReplaySource, hilo_2d, hilo_kernel, ohlcv_to_frame  # noqa: E402
+
+# 200 barras só para a montagem original com shapes, que cresce de forma quadrática
+DEFAULT_SIZES = ('200', '1k', '100k', '10M')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+PERIOD = 40
+SHIFT = 1
+SWEEP_PERIODS = list(range(10, 90, 5))
+
+
+def parse_size(text):
+    units = {'k': 1_000, 'M': 1_000_000}
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+
+def synthetic_ohlcv(n, seed=0, step_ms=300_000, start_ms=1_600_000_200_000):
+    """Passeio aleatório geométrico no formato do ccxt, como array ``(n, 6)`` float64."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.001, n)) * close
+    rows = np.empty((n, 6), dtype=np.float64)
+    rows[:, 0] = start_ms + np.arange(n, dtype=np.float64) * step_ms
+    rows[:, 1] = open_
+    rows[:, 2] = np.maximum(open_, close) + spread
+    rows[:, 3] = np.minimum(open_, close) - spread
+    rows[:, 4] = close
+    rows[:, 5] = rng.gamma(2.0, 50.0, n)
+    return rows
+
+
+class _LegacyPandas(ast.NodeTransformer):
+    """Adapta as variantes antigas ao pandas instalado sem mudar o que elas calculam.
+
+    ``pd.Series(index=...)`` sem dados nem dtype vira ``dtype=object`` (as
+    variantes guardam 'up'/'down' nele, o que o pandas atual recusa numa série
+    float) e ``s.replace(to_replace=x, method='ffill')``, removido do pandas,
+    vira ``s.mask(s == x).ffill().fillna(x)``.
+    """
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        func = node.func
+        keywords = {keyword.arg: keyword.value for keyword in node.keywords}
+        if (isinstance(func, ast.Attribute) and func.attr == 'Series' and not node.args
+                and set(keywords) == {'index'}):
+            node.keywords.append(ast.keyword('dtype', ast.Name('object', ast.Load())))
+        elif (isinstance(func, ast.Attribute) and func.attr == 'replace' and not node.args
+              and set(keywords) == {'to_replace', 'method'}
+              and isinstance(keywords['method'], ast.Constant) and keywords['method'].value == 'ffill'):
+            series, value = func.value, keywords['to_replace']
+            masked = ast.Call(ast.Attribute(series, 'mask', ast.Load()),
+                              [ast.Compare(series, [ast.Eq()], [value])], [])
+            filled = ast.Call(ast.Attribute(masked, 'ffill', ast.Load()), [], [])
+            node = ast.Call(ast.Attribute(filled, 'fillna', ast.Load()), [value], [])
+        return node
+
+
+@functools.lru_cache(maxsize=None)
+def load_legacy(filename, *names):
+    """Extrai funções das variantes antigas sem executar o código Streamlit do módulo."""
+    path = os.path.join(ROOT, filename)
+    with open(path, encoding='utf-8') as f:
+        tree = _LegacyPandas().visit(ast.parse(f.read(), path))
+    ast.fix_missing_locations(tree)
+    nodes = [node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name in names]
+    namespace = {'np': np, 'pd': pd}
+    exec(compile(ast.Module(nodes, type_ignores=[]), path, 'exec'), namespace)
+    return namespace[names[-1]]
+
+
+def candle_width(df):
+    diff = df['timestamp'].diff().dt.total_seconds()
+    return diff.fillna(diff.median() * 0.8) * 0.8
+
+
+def figure_shapes(df):
+    # montagem original: um shape de layout por candle
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True)
+    fig.add_trace(go.Candlestick(x=df['timestamp'], open=df['open'], high=df['high'], low=df['low'], close=df['close']), row=1, col=1)
+    for i in range(len(df)):
+        if pd.notna(df['hilo'].iloc[i]) and pd.notna(df['candle_width'].iloc[i]):
+            half_width = pd.Timedelta(seconds=df['candle_width'].iloc[i] / 2)
+            fig.add_shape(type="line", x0=df['timestamp'].iloc[i] - half_width, x1=df['timestamp'].iloc[i] + half_width,
+                          y0=df['hilo'].iloc[i], y1=df['hilo'].iloc[i],
+                          line=dict(color="red" if df['position'].iloc[i] == 1 else "green", width=2), row=1, col=1)
+    fig.add_trace(go.Bar(x=df['timestamp'], y=df['volume']), row=2, col=1)
+    return fig.to_json()
+
+
+def figure_traces(df, webgl=False):
+    from plotly.subplots import make_subplots
+    import plotly.graph_objects as go
+
+    from hilo.charts import hilo_stairs_traces, volume_trace
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True)
+    fig.add_trace(go.Candlestick(x=df['timestamp'], open=df['open'], high=df['high'], low=df['low'], close=df['close']), row=1, col=1)
+    for trace in hilo_stairs_traces(df['timestamp'], df['candle_width'], df['hilo'], df['position'], webgl=webgl):
+        fig.add_trace(trace, row=1, col=1)
+    fig.add_trace(volume_trace(df['timestamp'], df['volume'], webgl=webgl), row=2, col=1)
+    return fig.to_json()
+
+
+def figure_decimated(df):
+    from hilo.charts import MAX_POINTS, decimate_candles
+
+    return figure_traces(decimate_candles(df, MAX_POINTS), webgl=True)
+
+
+def hilo_frame(rows):
+    df = ohlcv_to_frame(rows)
+    hilo, position = hilo_kernel(df['high'].values, df['low'].values, df['close'].values, PERIOD, SHIFT)
+    df['hilo'], df['position'] = hilo, position
+    df['candle_width'] = candle_width(df)
+    return df
+
+
+def stream_state(df):
+    state = HiloState(PERIOD, SHIFT)
+    for candle in zip(df['timestamp'].values, df['open'].values, df['high'].values, df['low'].values, df['close'].values):
+        state.update(candle)
+    return state
+
+
+def replay_source(rows):
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, 'BTC-USDT.parquet')
+        ohlcv_to_frame(rows).to_parquet(path, index=False)
+        return ReplaySource(path, speed=math.inf)
+    finally:
+        shutil.rmtree(directory)
+
+
+def replay_stream(source):
+    # o mesmo caminho do modo ao vivo: candles fechados -> LiveStream -> HiloState
+    feed = ReplayFeed(source, autostart=False)
+    stream = feed.subscribe('BTC/USDT', source.base_timeframe)
+    stream.seed(ohlcv_to_frame(source.series('BTC/USDT')[:PERIOD * 2]), PERIOD, SHIFT)
+    feed.advance()
+    return stream
+
+
+# (grupo, nome, preparo(rows) -> args, função, maior n em que ainda é razoável rodar)
+CASES = [
+    ('indicador', 'hilo_kernel', lambda rows: (rows[:, 2], rows[:, 3], rows[:, 4], PERIOD, SHIFT), hilo_kernel, None),
+    ('indicador', 'hilo_2d (16 períodos)', lambda rows: (rows[:, 2], rows[:, 3], rows[:, 4], SWEEP_PERIODS, SHIFT),
+     hilo_2d, 1_000_000),
+    ('indicador', 'hilo_2d SMA (16 períodos)',
+     lambda rows: (rows[:, 2], rows[:, 3], rows[:, 4], SWEEP_PERIODS, SHIFT, 'sma'), hilo_2d, 1_000_000),
+    ('indicador', 'HiloState.update', ohlcv_to_frame, stream_state, 1_000_000),
+    ('indicador', 'replay (ReplayFeed → LiveStream)', replay_source, replay_stream, 1_000_000),
+    ('indicador', 'loop em lista (streamlit_app_ok)', lambda rows: (ohlcv_to_frame(rows), PERIOD, SHIFT),
+     lambda *a: load_legacy('streamlit_app_ok.py', 'ema', 'hilo_activator_refactored')(*a), 100_000),
+    ('indicador', 'loop com iloc (streamlit_app_perfect)', lambda rows: (ohlcv_to_frame(rows), PERIOD, SHIFT),
+     lambda *a: load_legacy('streamlit_app_perfect.py', 'ema', 'hilo_activator_stairs')(*a), 100_000),
+    ('indicador', 'rolling/ffill (streamlit_app_old)', lambda rows: (ohlcv_to_frame(rows), PERIOD, SHIFT),
+     lambda *a: load_legacy('streamlit_app_old.py', 'hilo_activator_stairs')(*a), None),
+    ('dados', 'DataFrame de listas do ccxt', lambda rows: (rows.tolist(),), ohlcv_to_frame, 1_000_000),
+    ('dados', 'Candles.from_ohlcv', lambda rows: (rows,), Candles.from_ohlcv, None),
+    ('gráfico', 'shapes por candle (original)', hilo_frame, figure_shapes, 200),
+    ('gráfico', 'degraus em 2 traços', hilo_frame, figure_traces, 1_000_000),
+    ('gráfico', 'decimado + WebGL', hilo_frame, figure_decimated, None),
+]
+
+
+def _as_args(prepared):
+    return prepared if isinstance(prepared, tuple) else (prepared,)
+
+
+def run_case(func, args, repeat, memory):
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        func(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+
+def run(sizes, repeat=3, memory=True, only=None):
+    results = []
+    for size in sizes:
+        n = parse_size(size)
+        rows = synthetic_ohlcv(n)
+        for group, name, prepare, func, max_n in CASES:
+            if only and only not in name:
+                continue
+            entry = {'group': group, 'case': name, 'size': size, 'bars': n}
+            if max_n is not None and n > max_n:
+                entry['status'] = 'pulado'
+            else:
+                try:
+                    args = _as_args(prepare(rows))
+                    seconds, peak = run_case(func, args, repeat, memory)
+                    entry.update(status='ok', seconds=seconds, bars_per_s=n / seconds, peak_bytes=peak)
+                except Exception as e:
+                    entry['status'] = f'erro: {type(e).__name__}: {e}'
+            results.append(entry)
+            print(format_row(entry), flush=True)
+        del rows
+    return results
+
+
+def format_row(entry):
+    if entry['status'] != 'ok':
+        return f"{entry['group']:<10} {entry['case']:<40} {entry['size']:>6}  {entry['status'][:60]}"
+    peak = '-' if entry['peak_bytes'] is None else f"{entry['peak_bytes'] / 2**20:9.1f} MiB"
+    return (f"{entry['group']:<10} {entry['case']:<40} {entry['size']:>6}  "
+            f"{entry['seconds'] * 1000:10.2f} ms  {entry['bars_per_s']:14,.0f} barras/s  {peak}")
+
+
+def check_regressions(results, baseline, threshold, only=None):
+    """Casos que pioraram em relação ao baseline: ``[(entrada atual ou None, entrada do baseline)]``.
+
+    Conta como regressão a vazão que caiu mais que ``threshold``, o caso que
+    passou de ok para erro e o caso ok no baseline que sumiu da rodada atual
+    (considerando só os tamanhos rodados e o filtro ``only``).
+    """
+    current = {(entry['case'], entry['size']): entry for entry in results}
+    sizes = {entry['size'] for entry in results}
+    regressions = []
+    for old in baseline:
+        if old.get('status') != 'ok' or old['size'] not in sizes or (only and only not in old['case']):
+            continue
+        entry = current.get((old['case'], old['size']))
+        if entry is None or entry['status'].startswith('erro'):
+            regressions.append((entry, old))
+        elif entry['status'] == 'ok' and entry['bars_per_s'] < old['bars_per_s'] * (1 - threshold):
+            regressions.append((entry, old))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n')[0])
+    parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help="ex.: 1k,100k,10M")
+    parser.add_argument('--repeat', type=int, default=3, help="repetições por caso (vale a melhor)")
+    parser.add_argument('--no-memory', action='store_true', help="não medir pico de memória (tracemalloc)")
+    parser.add_argument('--only', help="roda só os casos cujo nome contém este texto")
+    parser.add_argument('--json', help="grava os resultados em JSON")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true', help="falha se houver regressão contra o baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="queda de vazão tolerada (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes.split(','), args.repeat, not args.no_memory, args.only)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline gravado em {args.baseline}")
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"baseline não encontrado: {args.baseline} (gere com --save-baseline)", file=sys.stderr)
+            return 2
+        with open(args.baseline) as f:
+            regressions = check_regressions(results, json.load(f), args.threshold, args.only)
+        for entry, old in regressions:
+            if entry is None:
+                detail = "ausente da rodada atual"
+            elif entry['status'] != 'ok':
+                detail = entry['status']
+            else:
+                detail = f"{entry['bars_per_s']:,.0f} barras/s"
+            print(f"REGRESSÃO {old['case']} [{old['size']}]: {detail} "
+                  f"contra {old['bars_per_s']:,.0f} barras/s no baseline", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
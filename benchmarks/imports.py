@@ -0,0 +1,91 @@
+"""Tempo de import a frio, cada caso num interpretador novo, contra um orçamento.
+
+Mede o que um worker recém-criado paga antes de responder: o pacote, o
+caminho headless do indicador, o caminho de dados e o cliente da exchange.
+Exemplos::
+
+    python -m benchmarks.imports            # imprime a tabela
+    python -m benchmarks.imports --check    # falha se algum caso passar do orçamento
+    python -m benchmarks.imports --detail "import hilo"   # módulos mais caros (-X importtime)
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (instrução, orçamento em segundos, módulos que não podem ter sido carregados)
+CASES = [
+    ("import hilo", 0.35, ('pandas', 'ccxt.base.exchange', 'plotly')),
+    ("from hilo import ema, hilo_kernel", 0.35, ('pandas', 'ccxt.base.exchange', 'plotly')),
+    ("from hilo import HiloState, IndicatorCache", 0.35, ('pandas', 'ccxt.base.exchange', 'plotly')),
+    ("from hilo import Candles, fetch_history", 1.0, ('ccxt.base.exchange', 'plotly')),
+    ("from hilo import create_binance_testnet; create_binance_testnet()", 0.6, ('pandas', 'ccxt.bybit')),
+    ("import hilo.charts", 1.2, ('ccxt.base.exchange',)),
+]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - start
+print(elapsed, ','.join(name for name in {forbidden!r} if name in sys.modules))
+"""
+
+
+def measure(statement, forbidden=(), repeat=3):
+    """Melhor tempo de ``statement`` em ``repeat`` interpretadores novos e os módulos proibidos carregados."""
+    best, loaded = None, []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement, forbidden=tuple(forbidden))],
+                             cwd=ROOT, capture_output=True, text=True, check=True).stdout.split()
+        seconds = float(out[0])
+        best = seconds if best is None else min(best, seconds)
+        loaded = out[1].split(',') if len(out) > 1 else []
+    return best, loaded
+
+
+def import_detail(statement, top=15):
+    """Os ``top`` módulos com maior tempo acumulado segundo ``python -X importtime``."""
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.imports', description=__doc__.split('\n')[0])
+    parser.add_argument('--repeat', type=int, default=3, help="interpretadores por caso (vale o melhor)")
+    parser.add_argument('--check', action='store_true', help="falha se algum caso estourar o orçamento")
+    parser.add_argument('--detail', metavar='INSTRUÇÃO', help="mostra os módulos mais caros da instrução")
+    args = parser.parse_args(argv)
+
+    if args.detail:
+        for cumulative, name in import_detail(args.detail):
+            print(f"{cumulative / 1000:10.1f} ms  {name}")
+        return 0
+
+    failures = []
+    for statement, budget, forbidden in CASES:
+        seconds, loaded = measure(statement, forbidden, args.repeat)
+        status = 'ok'
+        if seconds > budget:
+            status = 'ACIMA DO ORÇAMENTO'
+        if loaded:
+            status = f"carregou {', '.join(loaded)}"
+        if status != 'ok':
+            failures.append(statement)
+        print(f"{statement:<66} {seconds * 1000:8.1f} ms  (orçamento {budget * 1000:.0f} ms)  {status}", flush=True)
+    if args.check and failures:
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
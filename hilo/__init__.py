@@ -0,0 +1,128 @@
+"""Hilo Activator: indicador, dados da exchange e ferramentas de linha de comando.
+
+Só ``assets``, ``metrics`` e os kernels NumPy são carregados com o pacote; o
+resto (pandas, ccxt, pyarrow) entra no primeiro acesso ao nome, via
+``__getattr__`` do módulo. ``from hilo import ema`` não importa pandas nem
+ccxt; ``from hilo import fetch_history`` importa só o que ``hilo.data`` usa.
+"""
+import importlib
+
+from .assets import assets
+from .kernels import JIT_AVAILABLE, MA_MODES, ema_2d, hilo_2d, moving_average_2d
+from .indicators import ema, hilo_kernel, hilo_activator_refactored, moving_average
+from .metrics import Metrics, append_log, metrics, start_http_server
+
+# nome exportado -> submódulo que o define, importado só quando o nome é pedido
+_LAZY = {
+    "SharedExchange": "exchange",
+    "binance_class": "exchange",
+    "create_binance_testnet": "exchange",
+    "HiloState": "state",
+    "Candles": "candles",
+    "IndicatorCache": "cache",
+    "CandleStore": "store",
+    "MarketCatalog": "markets",
+    "CircuitBreaker": "refresh",
+    "RefreshingCache": "refresh",
+    "fetch_candles": "data",
+    "fetch_history": "data",
+    "fetch_ohlcv_frame": "data",
+    "iter_history_pages": "data",
+    "ohlcv_to_frame": "data",
+    "store_name": "data",
+    "sync_ohlcv": "data",
+    "bars_since_flip": "scanner",
+    "scan_assets": "scanner",
+    "summarize_hilo": "scanner",
+    "compute_hilo_grid": "engine",
+    "iter_hilo_jobs": "engine",
+    "FlipAlerts": "alerts",
+    "StdoutSink": "alerts",
+    "FileSink": "alerts",
+    "WebhookSink": "alerts",
+    "best_parameters": "sweep",
+    "ema_matrix": "sweep",
+    "sweep_assets": "sweep",
+    "sweep_hilo": "sweep",
+    "backtest_assets": "backtest",
+    "backtest_positions": "backtest",
+    "backtest_summary": "backtest",
+    "MultiTimeframeLoader": "resample",
+    "resample_ohlcv": "resample",
+    "ExchangeSource": "sources",
+    "ReplayClock": "sources",
+    "ReplayFeed": "sources",
+    "ReplaySource": "sources",
+    "read_candles": "sources",
+}
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+__all__ = [
+    "assets",
+    "binance_class",
+    "create_binance_testnet",
+    "SharedExchange",
+    "JIT_AVAILABLE",
+    "ema_2d",
+    "hilo_2d",
+    "MA_MODES",
+    "moving_average_2d",
+    "moving_average",
+    "ema",
+    "hilo_kernel",
+    "hilo_activator_refactored",
+    "HiloState",
+    "Candles",
+    "IndicatorCache",
+    "CandleStore",
+    "MarketCatalog",
+    "CircuitBreaker",
+    "RefreshingCache",
+    "fetch_candles",
+    "fetch_history",
+    "fetch_ohlcv_frame",
+    "iter_history_pages",
+    "ohlcv_to_frame",
+    "store_name",
+    "sync_ohlcv",
+    "bars_since_flip",
+    "scan_assets",
+    "summarize_hilo",
+    "compute_hilo_grid",
+    "iter_hilo_jobs",
+    "FlipAlerts",
+    "StdoutSink",
+    "FileSink",
+    "WebhookSink",
+    "best_parameters",
+    "ema_matrix",
+    "sweep_assets",
+    "sweep_hilo",
+    "backtest_assets",
+    "backtest_positions",
+    "backtest_summary",
+    "MultiTimeframeLoader",
+    "resample_ohlcv",
+    "ExchangeSource",
+    "ReplayClock",
+    "ReplayFeed",
+    "ReplaySource",
+    "read_candles",
+    "Metrics",
+    "append_log",
+    "metrics",
+    "start_http_server",
+]
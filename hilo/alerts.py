@@ -0,0 +1,188 @@
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .engine import iter_hilo_jobs
+from .metrics import append_log, metrics
+from .resample import parse_timeframe_ms
+
+POSITION_LABELS = {-1: "Alta", 1: "Baixa"}
+
+# quantas viradas já enviadas ficam na memória para descartar repetições
+DEDUP_HISTORY = 10000
+
+
+def closed_candles(df, timeframe, now=None):
+    """Só os candles já fechados (a exchange devolve também o candle em formação)."""
+    if df is None or df.empty:
+        return df
+    now_ms = (time.time() if now is None else now) * 1000
+    close_ms = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64) + parse_timeframe_ms(timeframe)
+    return df[close_ms <= now_ms]
+
+
+def format_alert(alert):
+    return (f"{alert['ticker']} {alert['timeframe']}: virou para {POSITION_LABELS[alert['position']]} "
+            f"em {alert['close']:.4f} (Hilo {alert['hilo']:.4f}, candle de {alert['timestamp']})")
+
+
+class StdoutSink:
+    """Uma linha legível por alerta na saída padrão (ou em ``stream``)."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def send(self, alerts):
+        stream = self.stream or sys.stdout
+        for alert in alerts:
+            stream.write(format_alert(alert) + '\n')
+        stream.flush()
+
+
+class FileSink:
+    """Acrescenta cada alerta como uma linha JSON em ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, alerts):
+        for alert in alerts:
+            append_log(self.path, alert)
+
+
+class WebhookSink:
+    """Envia os alertas de uma avaliação num único POST JSON ``{"alerts": [...]}``."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        body = json.dumps({'alerts': alerts}, default=str).encode()
+        request = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+class FlipAlerts:
+    """Alertas de virada de posição do Hilo para todos os ativos.
+
+    ``evaluate`` recebe os candles fechados de todos os ativos, calcula o Hilo
+    de todos numa única passada e gera um alerta para cada ativo cuja posição
+    mudou no último candle. ``watch`` faz o mesmo a partir dos candles
+    fechados de um ``LiveStream`` (WebSocket ou replay), sem esperar uma nova
+    busca REST. Um alerta já enviado (mesmo ativo, timeframe, candle e
+    posição) não se repete, e a falha de um destino não impede os demais.
+    """
+
+    def __init__(self, assets, timeframe, shift=1, mode='ema', sinks=None, history=DEDUP_HISTORY):
+        self.periods = {asset['ticker']: [asset['period']] for asset in assets}
+        self.timeframe = timeframe
+        self.timeframe_ms = parse_timeframe_ms(timeframe)
+        self.shift = shift
+        self.mode = mode
+        self.sinks = list(sinks) if sinks is not None else [StdoutSink()]
+        self.history = history
+        self._sent = OrderedDict()
+        self._sent_lock = threading.Lock()
+        self._positions = {}
+        self._pending = queue.Queue()
+
+    def evaluate(self, frames):
+        with metrics.timer('alerts'):
+            frames = {ticker: df for ticker, df in frames.items() if ticker in self.periods and df is not None}
+            periods = {ticker: self.periods[ticker] for ticker in frames}
+            alerts = []
+            for row in iter_hilo_jobs(frames, periods, [self.shift], max_workers=1, mode=self.mode):
+                if row['error'] is not None or row['bars_since_flip'] != 0:
+                    continue
+                timestamp = pd.Timestamp(frames[row['ticker']]['timestamp'].iloc[-1])
+                alert = self._alert(row['ticker'], row['period'], timestamp, row['position'], row['close'], row['hilo'])
+                if self._remember(alert):
+                    alerts.append(alert)
+        if alerts:
+            metrics.count('alerts_sent', len(alerts))
+            self._dispatch(alerts)
+        return alerts
+
+    def watch(self, stream):
+        """Avalia cada candle fechado que chegar a ``stream`` (um ``LiveStream`` já semeado com o Hilo do ativo).
+
+        A virada é detectada na thread do feed, logo após o fechamento; os
+        alertas ficam numa fila até ``dispatch_pending`` enviá-los.
+        """
+        ticker = stream.symbol
+        period = self.periods[ticker][0]
+        key = (period, self.shift, self.mode)
+        self._positions[ticker] = stream.states[key].position
+        # o Hilo vigiado não pode sair do limite de estados do stream
+        stream.pinned.add(key)
+
+        def on_closed(stream, row):
+            # o stream pode refazer os estados (ver ``LiveStream.seed``): busca o atual a cada candle
+            state = stream.states[key]
+            previous = self._positions[ticker]
+            self._positions[ticker] = state.position
+            if previous == 0 or state.position in (0, previous):
+                return
+            alert = self._alert(ticker, period, pd.Timestamp(int(row[0]), unit='ms'), state.position, row[4], state.hilo)
+            if self._remember(alert):
+                self._pending.put(alert)
+
+        stream.listeners.append(on_closed)
+
+    def dispatch_pending(self, timeout=None):
+        """Envia de uma vez os alertas gerados por ``watch``, esperando até ``timeout`` s pelo primeiro."""
+        try:
+            alerts = [self._pending.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                alerts.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        metrics.count('alerts_sent', len(alerts))
+        self._dispatch(alerts)
+        return alerts
+
+    def _alert(self, ticker, period, timestamp, position, close, hilo):
+        detected_at = time.time()
+        return {
+            'ticker': ticker,
+            'timeframe': self.timeframe,
+            'period': period,
+            'timestamp': timestamp.isoformat(),
+            'position': int(position),
+            'previous': -int(position),
+            'close': float(close),
+            'hilo': float(hilo),
+            'detected_at': detected_at,
+            # do fechamento do candle até a detecção
+            'latency_ms': detected_at * 1000 - timestamp.value // 1_000_000 - self.timeframe_ms,
+        }
+
+    def _remember(self, alert):
+        key = (alert['ticker'], alert['timeframe'], alert['timestamp'], alert['position'])
+        with self._sent_lock:
+            if key in self._sent:
+                return False
+            self._sent[key] = True
+            while len(self._sent) > self.history:
+                self._sent.popitem(last=False)
+            return True
+
+    def _dispatch(self, alerts):
+        for sink in self.sinks:
+            try:
+                sink.send(alerts)
+            except Exception as e:
+                metrics.count('alert_sink_errors', sink=type(sink).__name__)
+                print(f"Erro ao enviar alertas para {type(sink).__name__}: {e}", file=sys.stderr)
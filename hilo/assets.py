@@ -0,0 +1,31 @@
+# Lista de ativos com períodos específicos
+assets = [
+    {"id": 1, "ticker": "BTC/USDT", "period": 40},
+    {"id": 2, "ticker": "ETH/USDT", "period": 23},
+    {"id": 3, "ticker": "ADA/USDT", "period": 43},
+    {"id": 4, "ticker": "NEO/USDT", "period": 30},
+    {"id": 5, "ticker": "LINK/USDT", "period": 31},
+    {"id": 6, "ticker": "MANA/USDT", "period": 52},
+    {"id": 7, "ticker": "SUSHI/USDT", "period": 40},
+    {"id": 8, "ticker": "ATOM/USDT", "period": 20},
+    {"id": 9, "ticker": "FTM/USDT", "period": 52},
+    {"id": 12, "ticker": "XRP/USDT", "period": 40},
+    {"id": 13, "ticker": "SOL/USDT", "period": 38},
+    {"id": 14, "ticker": "DOGE/USDT", "period": 42},
+    {"id": 15, "ticker": "BNB/USDT", "period": 50},
+    {"id": 16, "ticker": "LTC/USDT", "period": 33},
+    {"id": 17, "ticker": "DOT/USDT", "period": 37},
+    {"id": 18, "ticker": "AVAX/USDT", "period": 46},
+    {"id": 20, "ticker": "MATIC/USDT", "period": 29},
+    {"id": 21, "ticker": "AXS/USDT", "period": 32},
+    {"id": 22, "ticker": "ALGO/USDT", "period": 27},
+    {"id": 23, "ticker": "AAVE/USDT", "period": 35},
+    {"id": 24, "ticker": "UNI/USDT", "period": 39},
+    {"id": 25, "ticker": "FIL/USDT", "period": 34},
+    {"id": 26, "ticker": "SAND/USDT", "period": 28},
+    {"id": 27, "ticker": "CRV/USDT", "period": 41},
+    {"id": 28, "ticker": "FTT/USDT", "period": 36},
+    {"id": 29, "ticker": "VET/USDT", "period": 30},
+    {"id": 30, "ticker": "THETA/USDT", "period": 31},
+    {"id": 31, "ticker": "GALA/USDT", "period": 43}
+]
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from .indicators import hilo_kernel
+
+DEFAULT_FEE = 0.0004       # taxa taker dos futuros da Binance, por lado
+DEFAULT_SLIPPAGE = 0.0002  # por lado
+
+
+def position_exposure(position, allow_short=True):
+    """Converte ``position`` do Hilo (-1 alta, 1 baixa, 0 aquecimento) em exposição +1/-1/0."""
+    exposure = -np.asarray(position, dtype=np.int8)
+    if not allow_short:
+        exposure = np.maximum(exposure, 0)
+    return exposure
+
+
+def backtest_positions(close, position, timestamp=None, fee=DEFAULT_FEE, slippage=DEFAULT_SLIPPAGE, allow_short=True):
+    """Backtest vetorizado: opera no fechamento do candle em que a posição vira.
+
+    A exposição decidida no fechamento ``i`` rende o retorno de ``i`` para
+    ``i + 1``; cada mudança de exposição paga ``fee + slippage`` por unidade
+    negociada (uma virada de comprado para vendido negocia duas). Devolve
+    ``equity`` e ``drawdown`` por candle e a lista de operações, tudo montado
+    a partir de arrays.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    exposure = position_exposure(position, allow_short)
+    n = len(close)
+    cost = fee + slippage
+
+    held = np.zeros(n, dtype=np.float64)
+    held[1:] = exposure[:-1] * (close[1:] / close[:-1] - 1)
+    traded = np.abs(np.diff(exposure, prepend=0)).astype(np.float64)
+    equity = np.cumprod((1 + held) * (1 - traded * cost))
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    # cada trecho de exposição constante e não nula é uma operação
+    bounds = np.flatnonzero(np.diff(exposure, prepend=0))
+    segment_end = np.append(bounds[1:], n - 1)
+    keep = exposure[bounds] != 0
+    starts, ends = bounds[keep], segment_end[keep]
+    still_open = np.flatnonzero(keep) == len(bounds) - 1
+
+    side = exposure[starts].astype(np.float64)
+    entry = close[starts] * (1 + side * slippage)
+    exit_ = close[ends] * (1 - side * slippage)
+    trades = pd.DataFrame({
+        'entry_index': starts,
+        'exit_index': ends,
+        'side': np.where(side > 0, 'long', 'short'),
+        'entry_price': entry,
+        'exit_price': exit_,
+        'bars': ends - starts,
+        'return': side * (exit_ / entry - 1) - 2 * fee,
+        'open': still_open,
+    })
+    if timestamp is not None:
+        timestamp = np.asarray(timestamp)
+        trades.insert(0, 'exit_time', timestamp[ends])
+        trades.insert(0, 'entry_time', timestamp[starts])
+    index = pd.Index(timestamp) if timestamp is not None else None
+    return {
+        'equity': pd.Series(equity, index=index, name='equity'),
+        'drawdown': pd.Series(drawdown, index=index, name='drawdown'),
+        'trades': trades,
+    }
+
+
+def backtest_summary(result):
+    trades = result['trades']
+    return {
+        'total_return': result['equity'].iloc[-1] - 1 if len(result['equity']) else 0.0,
+        'max_drawdown': result['drawdown'].min() if len(result['drawdown']) else 0.0,
+        'trades': len(trades),
+        'win_rate': (trades['return'] > 0).mean() if len(trades) else np.nan,
+    }
+
+
+def backtest_assets(frames, assets, shift=1, fee=DEFAULT_FEE, slippage=DEFAULT_SLIPPAGE, allow_short=True, mode='ema'):
+    """Resumo do backtest de cada ativo de ``frames`` com o ``period`` configurado em ``assets``."""
+    rows = []
+    for asset in assets:
+        df = frames.get(asset['ticker'])
+        if df is None or df.empty:
+            continue
+        _, position = hilo_kernel(df['high'].values, df['low'].values, df['close'].values, asset['period'], shift, mode)
+        if len(position) == 0:
+            continue
+        result = backtest_positions(df['close'].values, position, fee=fee, slippage=slippage, allow_short=allow_short)
+        rows.append({'ticker': asset['ticker'], 'period': asset['period'], **backtest_summary(result)})
+    return pd.DataFrame(rows, columns=['ticker', 'period', 'total_return', 'max_drawdown', 'trades', 'win_rate'])
@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class IndicatorCache:
+    """Cache LRU de resultados do Hilo, limitado em bytes.
+
+    A chave é ``(symbol, timeframe, period, shift, mode)`` mais a versão dos dados
+    (``Candles.version``). Quando chega uma versão nova para a mesma janela
+    ``(symbol, timeframe, len(candles))``, os resultados das versões antigas
+    são descartados. Os arrays devolvidos são somente leitura porque são
+    compartilhados entre sessões.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def hilo(self, symbol, timeframe, candles, period, shift=1, mode='ema'):
+        series = (symbol, timeframe, len(candles))
+        version = candles.version
+        key = (series, period, shift, mode, version)
+        with self._lock:
+            if self._versions.get(series) != version:
+                self._invalidate(series)
+                self._versions[series] = version
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        hilo, position = candles.hilo(period, shift, mode)
+        hilo.setflags(write=False)
+        position.setflags(write=False)
+        result = (hilo, position)
+        with self._lock:
+            if self._versions.get(series) == version and key not in self._entries:
+                self._entries[key] = result
+                self.nbytes += hilo.nbytes + position.nbytes
+                self._evict()
+        return result
+
+    def stats(self):
+        return {'entries': len(self._entries), 'bytes': self.nbytes, 'hits': self.hits, 'misses': self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.nbytes = 0
+
+    def _invalidate(self, series):
+        for key in [key for key in self._entries if key[0] == series]:
+            self._drop(key)
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        hilo, position = self._entries.pop(key)
+        self.nbytes -= hilo.nbytes + position.nbytes
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from .indicators import hilo_kernel
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class Candles:
+    """Contêiner compacto de candles: timestamps int64 (ms) e OHLCV em float32.
+
+    Ocupa 28 bytes por candle contra 48 do DataFrame float64/datetime. Colunas
+    derivadas (hilo, posição, largura) são calculadas sob demanda e não ficam
+    guardadas; ``to_frame`` monta o DataFrame só na borda de exibição. O
+    float32 guarda ~7 dígitos significativos, suficiente para gráfico e sinal;
+    use ``dtype=np.float64`` quando precisar do preço exato.
+    """
+
+    __slots__ = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, timestamp, open, high, low, close, volume, dtype=np.float32):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=dtype)
+        self.high = np.asarray(high, dtype=dtype)
+        self.low = np.asarray(low, dtype=dtype)
+        self.close = np.asarray(close, dtype=dtype)
+        self.volume = np.asarray(volume, dtype=dtype)
+
+    @classmethod
+    def from_ohlcv(cls, ohlcv, dtype=np.float32):
+        rows = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        return cls(rows[:, 0], *rows[:, 1:].T, dtype=dtype)
+
+    @classmethod
+    def from_frame(cls, df, dtype=np.float32):
+        timestamp = df['timestamp'].values
+        if np.issubdtype(timestamp.dtype, np.datetime64):
+            timestamp = timestamp.astype('datetime64[ms]').astype(np.int64)
+        return cls(timestamp, *(df[column].values for column in PRICE_COLUMNS), dtype=dtype)
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("Candles aceita apenas fatias")
+        return Candles(*(getattr(self, column)[index] for column in self.__slots__), dtype=self.close.dtype)
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, column).nbytes for column in self.__slots__)
+
+    @property
+    def version(self):
+        """Identifica o conteúdo para caches: muda com candles novos ou com o candle em formação."""
+        if self.empty:
+            return (0,)
+        return (len(self), int(self.timestamp[0]), int(self.timestamp[-1]), float(self.close[-1]), float(self.volume[-1]))
+
+    def tail(self, n):
+        return self[-n:] if n else self[:0]
+
+    def candle_width(self):
+        """Largura de cada candle em segundos, como no gráfico (80% do intervalo anterior)."""
+        diff = np.full(len(self), np.nan)
+        diff[1:] = np.diff(self.timestamp) / 1000
+        if len(diff) > 1:
+            diff[0] = np.median(diff[1:]) * 0.8
+        return diff * 0.8
+
+    def hilo(self, period, shift=1, mode='ema'):
+        """``(hilo, position)`` com o tamanho da série (NaN/0 se o histórico for curto)."""
+        hilo, position = hilo_kernel(self.high, self.low, self.close, period, shift, mode)
+        if len(hilo) == 0:
+            return np.full(len(self), np.nan), np.zeros(len(self), dtype=np.int64)
+        return hilo, position
+
+    def resample(self, timeframe, drop_partial=True):
+        from .resample import resample_arrays
+
+        return Candles(*resample_arrays(self.timestamp, self.open, self.high, self.low, self.close, self.volume,
+                                        timeframe, drop_partial), dtype=self.close.dtype)
+
+    def to_frame(self, **derived):
+        data = {'timestamp': pd.to_datetime(self.timestamp, unit='ms')}
+        data.update((column, getattr(self, column)) for column in PRICE_COLUMNS)
+        data.update(derived)
+        return pd.DataFrame(data)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+STAIRS_COLORS = {1: "red", -1: "green"}
+# Orçamento de pontos por série enviado ao navegador no modo para muitos candles
+MAX_POINTS = 2000
+
+
+def hilo_stairs_xy(timestamp, candle_width, hilo, position, down):
+    """Coordenadas dos degraus de uma cor, separados por NaN em ``y``.
+
+    Cada candle válido vira ``(ts - w/2, y), (ts + w/2, y), (ts + w/2, NaN)``;
+    ``down`` escolhe os degraus vermelhos (posição 1) ou os verdes.
+    """
+    timestamp = np.asarray(timestamp, dtype='datetime64[ns]')
+    candle_width = np.asarray(candle_width, dtype=np.float64)
+    hilo = np.asarray(hilo, dtype=np.float64)
+    position = np.asarray(position)
+
+    mask = ~np.isnan(hilo) & ~np.isnan(candle_width) & ((position == 1) == down)
+    half = (candle_width[mask] * 5e8).astype('timedelta64[ns]')
+    ts = timestamp[mask]
+    y = hilo[mask]
+
+    x = np.column_stack([ts - half, ts + half, ts + half]).ravel()
+    y = np.column_stack([y, y, np.full(len(y), np.nan)]).ravel()
+    return x, y
+
+
+def hilo_stairs_traces(timestamp, candle_width, hilo, position, webgl=False):
+    """No máximo dois traços (baixa em vermelho, alta em verde) no lugar de um shape por candle."""
+    scatter = go.Scattergl if webgl else go.Scatter
+    traces = []
+    for pos, color in STAIRS_COLORS.items():
+        x, y = hilo_stairs_xy(timestamp, candle_width, hilo, position, down=pos == 1)
+        if len(x):
+            traces.append(scatter(x=x, y=y, mode='lines', line=dict(color=color, width=2),
+                                     name='Hilo', connectgaps=False, hoverinfo='y'))
+    return traces
+
+
+def volume_trace(timestamp, volume, webgl=False):
+    if webgl:
+        return go.Scattergl(x=timestamp, y=volume, name='Volume', mode='lines', line_shape='hvh',
+                            fill='tozeroy', line=dict(width=0), fillcolor='rgba(0,0,0,0.5)')
+    return go.Bar(x=timestamp, y=volume, name='Volume', marker_color='rgba(0,0,0,0.5)')
+
+
+def decimate_candles(df, max_points=MAX_POINTS, x_range=None):
+    """Agrega os candles da janela visível em no máximo ``max_points`` baldes.
+
+    Cada balde preserva a abertura do primeiro candle, a máxima e a mínima
+    verdadeiras e o fechamento do último; o volume e a largura são somados e
+    ``hilo``/``position`` ficam com o valor do último candle do balde.
+    """
+    if x_range is not None:
+        start, end = (pd.Timestamp(x) for x in x_range)
+        df = df[(df['timestamp'] >= start) & (df['timestamp'] <= end)]
+    n = len(df)
+    size = -(-n // max_points) if n else 1
+    if size <= 1:
+        return df.reset_index(drop=True)
+
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+    out = {
+        'timestamp': df['timestamp'].values[starts],
+        'open': df['open'].values[starts],
+        'high': np.maximum.reduceat(df['high'].values, starts),
+        'low': np.minimum.reduceat(df['low'].values, starts),
+        'close': df['close'].values[ends],
+        'volume': np.add.reduceat(df['volume'].values, starts),
+    }
+    for column in ('hilo', 'position'):
+        if column in df:
+            out[column] = df[column].values[ends]
+    if 'candle_width' in df:
+        out['candle_width'] = np.add.reduceat(df['candle_width'].values, starts)
+    return pd.DataFrame(out)
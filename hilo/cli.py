@@ -0,0 +1,274 @@
+import argparse
+import json
+import math
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from .backtest import DEFAULT_FEE, DEFAULT_SLIPPAGE
+from .kernels import MA_MODES
+
+FORMATS = ('csv', 'json', 'parquet')
+FETCH_WORKERS = 8
+
+
+def write_table(df, output, fmt=None):
+    """Grava ``df`` em CSV, JSON ou Parquet; ``-`` escreve CSV/JSON na saída padrão."""
+    if fmt is None:
+        fmt = output.rsplit('.', 1)[-1] if '.' in output else 'csv'
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato não suportado: {fmt}")
+    if fmt == 'parquet':
+        if output == '-':
+            raise ValueError("Parquet precisa de um arquivo de saída")
+        df.to_parquet(output, index=False)
+    elif fmt == 'json':
+        # to_json escapa '/' ("BTC\/USDT"); regravar com json deixa os tickers legíveis
+        text = json.dumps(json.loads(df.to_json(orient='records', date_format='iso')), indent=2, ensure_ascii=False)
+        if output == '-':
+            sys.stdout.write(text + '\n')
+        else:
+            with open(output, 'w') as f:
+                f.write(text)
+    else:
+        df.to_csv(sys.stdout if output == '-' else output, index=False)
+
+
+def select_assets(tickers):
+    from .assets import assets
+
+    if not tickers or tickers == ['all']:
+        return assets
+    by_ticker = {asset['ticker']: asset for asset in assets}
+    # tickers fora da tabela usam o período padrão informado em --period
+    return [by_ticker.get(ticker, {'id': None, 'ticker': ticker, 'period': None}) for ticker in tickers]
+
+
+def open_sources(args):
+    from .markets import MarketCatalog
+
+    if args.replay:
+        from .sources import ReplaySource
+
+        source = ReplaySource(args.replay, speed=args.speed or math.inf)
+    else:
+        from .exchange import SharedExchange, create_binance_testnet
+        from .sources import ExchangeSource
+        from .store import CandleStore
+
+        store = None if args.no_store else CandleStore(args.cache_dir)
+        source = ExchangeSource(SharedExchange(create_binance_testnet), store)
+    return source, MarketCatalog(source.load_markets, name=source.name, root=args.cache_dir, persist=source.remote)
+
+
+def load_frames(args, selected, sources=None):
+    source, catalog = sources or open_sources(args)
+    invalid = catalog.invalid(selected)
+    for ticker in sorted(invalid):
+        print(f"{ticker} não tem mercado na exchange; ignorado", file=sys.stderr)
+
+    def load(asset):
+        try:
+            return asset['ticker'], source.fetch(asset['ticker'], args.timeframe, args.limit)
+        except Exception as e:
+            print(f"Erro ao obter dados para {asset['ticker']}: {e}", file=sys.stderr)
+            return asset['ticker'], None
+
+    # o cliente compartilhado espaça as requisições entre as threads
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        return {ticker: df for ticker, df in pool.map(load, [a for a in selected if a['ticker'] not in invalid])
+                if df is not None}
+
+
+def cmd_signals(args):
+    from .candles import Candles
+    from .engine import compute_hilo_grid
+
+    selected = select_assets(args.assets)
+    frames = load_frames(args, selected)
+    periods = {asset['ticker']: [args.period or asset['period']] for asset in selected if asset['ticker'] in frames}
+    if not args.series:
+        write_table(compute_hilo_grid(frames, periods, [args.shift], max_workers=args.workers,
+                                      mode=args.mode), args.output, args.format)
+        return
+    tables = []
+    for ticker, (period,) in periods.items():
+        candles = Candles.from_frame(frames[ticker], dtype='float64')
+        hilo, position = candles.hilo(period, args.shift, args.mode)
+        tables.append(candles.to_frame(hilo=hilo, position=position).assign(ticker=ticker, period=period))
+    write_table(pd.concat(tables, ignore_index=True) if tables else pd.DataFrame(), args.output, args.format)
+
+
+def cmd_sweep(args):
+    from .sweep import best_parameters, sweep_assets
+
+    selected = select_assets(args.assets)
+    frames = load_frames(args, selected)
+    results = sweep_assets(frames, range(args.min_period, args.max_period + 1), range(args.min_shift, args.max_shift + 1),
+                           max_workers=args.workers, mode=args.mode)
+    table = results if args.all_results else best_parameters(results, [a for a in selected if a['period']])
+    write_table(table, args.output, args.format)
+
+
+def cmd_backtest(args):
+    from .backtest import backtest_assets
+
+    selected = [dict(asset, period=args.period or asset['period']) for asset in select_assets(args.assets)]
+    frames = load_frames(args, selected)
+    write_table(backtest_assets(frames, selected, args.shift, args.fee, args.slippage, not args.long_only, args.mode),
+                args.output, args.format)
+
+
+def cmd_alerts(args):
+    from .alerts import FileSink, FlipAlerts, StdoutSink, WebhookSink, closed_candles
+    from .resample import parse_timeframe_ms
+
+    selected = [dict(asset, period=args.period or asset['period']) for asset in select_assets(args.assets)]
+    sinks = [] if args.quiet else [StdoutSink()]
+    sinks += [WebhookSink(url) for url in args.webhook]
+    sinks += [FileSink(path) for path in args.alert_file]
+    alerts = FlipAlerts(selected, args.timeframe, args.shift, args.mode, sinks)
+    sources = open_sources(args)
+    source = sources[0]
+    frames = load_frames(args, selected, sources)
+    alerts.evaluate({ticker: closed_candles(df, args.timeframe) for ticker, df in frames.items()})
+    if args.once:
+        return
+    if args.poll:
+        step = parse_timeframe_ms(args.timeframe) / 1000
+        while not (args.replay and source.finished(alerts.periods)):
+            if args.replay:
+                # um candle no relógio do replay
+                time.sleep(step / source.speed)
+            else:
+                # acorda logo depois do próximo fechamento de candle
+                time.sleep(step - time.time() % step + args.delay)
+            frames = load_frames(args, selected, sources)
+            alerts.evaluate({ticker: closed_candles(df, args.timeframe) for ticker, df in frames.items()})
+        return
+
+    # os candles fechados chegam pelo WebSocket (ou pelo relógio do replay) e o
+    # Hilo de cada ativo avança na hora: o alerta sai logo após o fechamento
+    feed = source.live_feed()
+    for ticker, df in frames.items():
+        stream = feed.subscribe(ticker, args.timeframe)
+        stream.seed(closed_candles(df, args.timeframe), alerts.periods[ticker][0], args.shift, args.mode)
+        alerts.watch(stream)
+    while not (args.replay and source.finished(alerts.periods)):
+        alerts.dispatch_pending(timeout=1)
+    # entrega o que o relógio já liberou e esvazia a fila
+    feed.advance()
+    alerts.dispatch_pending(timeout=0)
+
+
+def cmd_replay(args):
+    from .data import ohlcv_to_frame
+    from .sources import ReplayFeed, ReplaySource
+
+    if not args.replay:
+        raise SystemExit("replay precisa de --replay ARQUIVO")
+    source = ReplaySource(args.replay, speed=args.speed or math.inf, warmup=args.limit)
+    feed = ReplayFeed(source, autostart=False)
+    tickers = args.assets if args.assets and args.assets != ['all'] else sorted(source.candles)
+    streams = []
+    for asset in select_assets(tickers):
+        period = args.period or asset['period']
+        if period is None:
+            print(f"{asset['ticker']} não está na tabela de ativos; informe --period", file=sys.stderr)
+            continue
+        try:
+            stream = feed.subscribe(asset['ticker'], args.timeframe)
+        except ValueError as e:
+            print(f"Erro ao reproduzir {asset['ticker']}: {e}", file=sys.stderr)
+            continue
+        # semeia com os ``limit`` primeiros candles; o resto passa candle a candle pelo HiloState
+        stream.seed(ohlcv_to_frame(source.series(asset['ticker'], args.timeframe)[:args.limit]), period, args.shift,
+                    args.mode)
+        streams.append((stream, period))
+
+    start = time.perf_counter()
+    deadline = start + args.duration if args.duration else math.inf
+    while time.perf_counter() < deadline:
+        if not feed.advance() and source.finished([stream.symbol for stream, _ in streams]):
+            break
+        time.sleep(0 if math.isinf(source.speed) else feed.interval)
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for stream, period in streams:
+        state = stream.states[(period, args.shift, args.mode)]
+        rows.append({'ticker': stream.symbol, 'period': period, 'shift': args.shift, 'timeframe': args.timeframe,
+                     'candles': state.count, 'close': state.last_close, 'hilo': state.hilo,
+                     'position': state.position})
+    print(f"{feed.delivered:,} candles em {elapsed:.2f} s ({feed.delivered / max(elapsed, 1e-9) * 60:,.0f} candles/min)",
+          file=sys.stderr)
+    write_table(pd.DataFrame(rows), args.output, args.format)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='hilo', description="Hilo Activator sem interface: sinais, varredura e backtest.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('assets', nargs='*', help="tickers (ex.: BTC/USDT); vazio ou 'all' = todos os ativos")
+    common.add_argument('-t', '--timeframe', default='1d')
+    common.add_argument('-n', '--limit', type=int, default=500, help="número de candles")
+    common.add_argument('-p', '--period', type=int, help="período do Hilo (padrão: o da tabela de ativos)")
+    common.add_argument('-s', '--shift', type=int, default=1)
+    common.add_argument('-m', '--mode', choices=MA_MODES, default='ema', help="média das máximas/mínimas")
+    common.add_argument('-o', '--output', default='-', help="arquivo de saída ou '-' para a saída padrão")
+    common.add_argument('-f', '--format', choices=FORMATS, help="padrão: pela extensão do arquivo, senão csv")
+    common.add_argument('--cache-dir', help="diretório do armazém local de candles")
+    common.add_argument('--no-store', action='store_true', help="não usar o armazém local de candles")
+    common.add_argument('--workers', type=int, help="processos de cálculo (padrão: um por núcleo)")
+    common.add_argument('--replay', metavar='ARQUIVO',
+                        help="lê os candles de um CSV/Parquet (ou diretório) em vez da exchange")
+    common.add_argument('--speed', type=float, help="velocidade do replay (padrão: o arquivo inteiro de uma vez)")
+
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    signals = sub.add_parser('signals', parents=[common], help="último sinal de cada ativo")
+    signals.add_argument('--series', action='store_true', help="série completa de hilo/posição em vez do último sinal")
+    signals.set_defaults(func=cmd_signals)
+
+    sweep = sub.add_parser('sweep', parents=[common], help="melhores período/deslocamento por ativo")
+    sweep.add_argument('--min-period', type=int, default=2)
+    sweep.add_argument('--max-period', type=int, default=100)
+    sweep.add_argument('--min-shift', type=int, default=0)
+    sweep.add_argument('--max-shift', type=int, default=10)
+    sweep.add_argument('--all-results', action='store_true', help="grava a grade inteira em vez do melhor por ativo")
+    sweep.set_defaults(func=cmd_sweep)
+
+    backtest = sub.add_parser('backtest', parents=[common], help="resumo do backtest por ativo")
+    backtest.add_argument('--fee', type=float, default=DEFAULT_FEE)
+    backtest.add_argument('--slippage', type=float, default=DEFAULT_SLIPPAGE)
+    backtest.add_argument('--long-only', action='store_true')
+    backtest.set_defaults(func=cmd_backtest)
+
+    alerts = sub.add_parser('alerts', parents=[common], help="alertas de virada de posição a cada fechamento de candle")
+    alerts.add_argument('--webhook', action='append', default=[], help="URL que recebe um POST JSON por fechamento")
+    alerts.add_argument('--alert-file', action='append', default=[], help="arquivo que recebe um alerta JSON por linha")
+    alerts.add_argument('--quiet', action='store_true', help="não escrever os alertas na saída padrão")
+    alerts.add_argument('--poll', action='store_true',
+                        help="buscar via REST a cada fechamento em vez de acompanhar os candles pelo WebSocket")
+    alerts.add_argument('--delay', type=float, default=0.0, help="com --poll, segundos de espera após o fechamento")
+    alerts.add_argument('--once', action='store_true', help="avaliar uma vez e sair")
+    alerts.set_defaults(func=cmd_alerts)
+
+    replay = sub.add_parser('replay', parents=[common], help="reproduz --replay pelo Hilo incremental e mede a vazão")
+    replay.add_argument('--duration', type=float, help="segundos de replay (padrão: até o fim do arquivo)")
+    replay.set_defaults(func=cmd_replay)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for asset in select_assets(args.assets):
+        if asset['period'] is None and args.period is None and args.command != 'sweep':
+            parser.error(f"{asset['ticker']} não está na tabela de ativos; informe --period")
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .metrics import metrics
+
+OHLCV_COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+PAGE_LIMIT = 1000
+
+
+def ohlcv_to_frame(ohlcv):
+    df = pd.DataFrame(ohlcv, columns=OHLCV_COLUMNS)
+    df['timestamp'] = pd.to_datetime(df['timestamp'].astype(np.int64), unit='ms')
+    return df
+
+
+def timeframe_ms(exchange, timeframe):
+    return exchange.parse_timeframe(timeframe) * 1000
+
+
+def store_name(exchange):
+    """Nome do exchange no armazém: id, sandbox e tipo de mercado (ex.: ``binance-testnet-future``).
+
+    Só o ``id`` misturaria testnet, produção, spot e futuros no mesmo arquivo.
+    """
+    parts = [exchange.id]
+    if getattr(exchange, 'isSandboxModeEnabled', False):
+        parts.append('testnet')
+    default_type = (getattr(exchange, 'options', None) or {}).get('defaultType')
+    if default_type:
+        parts.append(default_type)
+    return '-'.join(parts)
+
+
+def iter_history_pages(exchange, symbol, timeframe, limit, page_size=PAGE_LIMIT, max_in_flight=2, until=None):
+    """Percorre o histórico de trás para frente, uma página por vez.
+
+    Os cursores ``since`` de cada página são conhecidos de antemão, então até
+    ``max_in_flight`` requisições ficam em voo, espaçadas por
+    ``exchange.rateLimit``. As páginas saem da mais recente para a mais antiga
+    e a iteração para na primeira página vazia (início da listagem). ``until``
+    (ms) é a abertura do candle mais recente pedido; o padrão é o candle atual.
+    """
+    step = timeframe_ms(exchange, timeframe)
+    last_open = (exchange.milliseconds() if until is None else until) // step * step
+    n_pages = -(-limit // page_size)
+    interval = getattr(exchange, 'rateLimit', 0) / 1000
+
+    def fetch(k):
+        upper = last_open - k * page_size * step
+        size = min(page_size, limit - k * page_size)
+        since = upper - (size - 1) * step
+        with metrics.timer('exchange_request'):
+            page = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=size)
+        metrics.count('exchange_requests')
+        return [row for row in page if since <= row[0] <= upper]
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        pending = []
+        next_page = 0
+        last_submit = 0.0
+        while next_page < n_pages or pending:
+            while next_page < n_pages and len(pending) < max_in_flight:
+                wait = last_submit + interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                last_submit = time.monotonic()
+                pending.append(pool.submit(fetch, next_page))
+                next_page += 1
+            page = pending.pop(0).result()
+            if not page:
+                for future in pending:
+                    future.cancel()
+                return
+            yield page
+
+
+def fetch_history(exchange, symbol, timeframe, limit, page_size=PAGE_LIMIT, max_in_flight=2, until=None):
+    """Carrega até ``limit`` candles em um único buffer ``(n, 6)`` float64.
+
+    Cada página é copiada no buffer assim que chega, preenchendo-o do fim para
+    o começo; a lista de listas completa nunca existe em memória.
+    """
+    buffer = np.empty((limit, len(OHLCV_COLUMNS)), dtype=np.float64)
+    start = limit
+    for page in iter_history_pages(exchange, symbol, timeframe, limit, page_size, max_in_flight, until):
+        page = np.asarray(page, dtype=np.float64)
+        start -= len(page)
+        buffer[start:start + len(page)] = page
+    return buffer[start:]
+
+
+def sync_ohlcv(exchange, store, symbol, timeframe, limit, name=None):
+    """Atualiza o armazém local e devolve os ``limit`` candles mais recentes."""
+    key = _sync_store(exchange, store, symbol, timeframe, limit, name)
+    with metrics.timer('frame_build'):
+        return store.load(key, limit)
+
+
+def _sync_store(exchange, store, symbol, timeframe, limit, name=None):
+    """Traz o armazém em dia para ``limit`` candles e devolve a chave usada.
+
+    Só pede ao exchange os candles a partir do último timestamp armazenado (o
+    último é pedido de novo porque podia estar em formação). Se o histórico
+    local for mais curto que ``limit``, pagina para trás a partir do primeiro
+    candle armazenado só o trecho que falta; quando o exchange devolve menos
+    que isso, o início da listagem fica registrado e não é pedido de novo.
+    A chave no armazém usa ``name`` (o nome da fonte) ou ``store_name(exchange)``.
+    """
+    key = (name or store_name(exchange), symbol, timeframe)
+    last_ts = store.last_timestamp(key)
+
+    if last_ts is None:
+        store.replace(key, fetch_history(exchange, symbol, timeframe, limit))
+        if 0 < store.count(key) < limit:
+            store.mark_listing_start(key)
+    else:
+        since = last_ts
+        while True:
+            with metrics.timer('exchange_request'):
+                ohlcv = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=PAGE_LIMIT)
+            metrics.count('exchange_requests')
+            store.append(key, ohlcv)
+            if len(ohlcv) < PAGE_LIMIT:
+                break
+            since = ohlcv[-1][0] + 1
+
+        missing = limit - store.count(key)
+        if missing > 0 and not store.listing_start_reached(key):
+            until = store.first_timestamp(key) - timeframe_ms(exchange, timeframe)
+            older = fetch_history(exchange, symbol, timeframe, missing, until=until)
+            store.prepend(key, older)
+            if len(older) < missing:
+                store.mark_listing_start(key)
+    return key
+
+
+def fetch_ohlcv_frame(exchange, symbol, timeframe, limit, store=None, name=None):
+    if store is None:
+        ohlcv = fetch_history(exchange, symbol, timeframe, limit)
+        if not len(ohlcv):
+            raise ValueError(f"Nenhum dado disponível para {symbol}")
+        with metrics.timer('frame_build'):
+            return ohlcv_to_frame(ohlcv)
+
+    df = sync_ohlcv(exchange, store, symbol, timeframe, limit, name)
+    if df.empty:
+        raise ValueError(f"Nenhum dado disponível para {symbol}")
+    return df
+
+
+def fetch_candles(exchange, symbol, timeframe, limit, store=None, name=None):
+    """Como ``fetch_ohlcv_frame``, mas devolve ``Candles`` (float32) sem montar DataFrame."""
+    from .candles import Candles
+
+    if store is None:
+        candles = Candles.from_ohlcv(fetch_history(exchange, symbol, timeframe, limit))
+    else:
+        key = _sync_store(exchange, store, symbol, timeframe, limit, name)
+        with metrics.timer('frame_build'):
+            candles = store.candles(key, limit)
+    if candles.empty:
+        raise ValueError(f"Nenhum dado disponível para {symbol}")
+    return candles
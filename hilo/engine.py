@@ -0,0 +1,151 @@
+"""Motor paralelo do Hilo para muitos ativos × períodos × deslocamentos.
+
+Os candles de todos os ativos são copiados uma única vez para um bloco de
+memória compartilhada; cada tarefa enviada ao pool de processos leva só o
+nome do bloco, o trecho do ativo e os parâmetros, e devolve linhas de resumo
+(nunca DataFrames nem as séries completas).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .kernels import COLUMN_LOOP_MAX, hilo_2d
+from .scanner import bars_since_flip
+
+ENGINE_COLUMNS = ['ticker', 'period', 'shift', 'close', 'hilo', 'position', 'distance_pct',
+                  'bars_since_flip', 'flips', 'pnl', 'error']
+
+
+class SharedCandles:
+    """high/low/close de vários ativos num bloco ``(3, total)`` de memória compartilhada."""
+
+    def __init__(self, frames):
+        self.spans = {}
+        total = 0
+        for ticker, df in frames.items():
+            self.spans[ticker] = (total, total + len(df))
+            total += len(df)
+        self.total = total
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, 3 * total * 8))
+        data = self.array()
+        for ticker, df in frames.items():
+            start, stop = self.spans[ticker]
+            for row, column in enumerate(('high', 'low', 'close')):
+                data[row, start:stop] = df[column].values
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def array(self):
+        return np.ndarray((3, self.total), dtype=np.float64, buffer=self._shm.buf)
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# blocos já abertos neste processo (um pool vive o tempo de uma chamada)
+_attached = {}
+
+
+def _attach(name, total):
+    shm = _attached.get(name)
+    if shm is None:
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    return np.ndarray((3, total), dtype=np.float64, buffer=shm.buf)
+
+
+def summarize_columns(ticker, high, low, close, periods, shift, mode='ema'):
+    """Hilo de um ativo para vários períodos com o mesmo ``shift``; uma linha de resumo por período.
+
+    ``flips`` e ``pnl`` seguem ``sweep_hilo``: trocas de posição depois do
+    aquecimento e soma dos retornos log do sinal (comprado em -1, vendido em 1).
+    """
+    periods = list(periods)
+    hilo, position = hilo_2d(high, low, close, periods, shift, mode)
+    n = len(close)
+    last_close = float(close[-1]) if n else np.nan
+    if n > 1:
+        flips = ((position[1:] != position[:-1]) & (position[:-1] != 0)).sum(axis=0)
+        pnl = -(position[:-1] * np.diff(np.log(close))[:, None]).sum(axis=0)
+    else:
+        flips = np.zeros(len(periods), dtype=np.int64)
+        pnl = np.zeros(len(periods))
+    rows = []
+    for j, period in enumerate(periods):
+        row = {'ticker': ticker, 'period': period, 'shift': shift, 'close': last_close}
+        if n < period + shift:
+            row.update(hilo=np.nan, position=0, distance_pct=np.nan, bars_since_flip=np.nan,
+                       flips=0, pnl=0.0, error='histórico curto demais')
+        else:
+            last = hilo[-1, j]
+            row.update(hilo=last, position=int(position[-1, j]), distance_pct=(last_close - last) / last_close * 100,
+                       bars_since_flip=bars_since_flip(position[:, j]), flips=int(flips[j]), pnl=float(pnl[j]),
+                       error=None)
+        rows.append(row)
+    return rows
+
+
+def _run_task(task):
+    name, total, ticker, start, stop, shift, periods, mode = task
+    high, low, close = _attach(name, total)[:, start:stop]
+    return summarize_columns(ticker, high, low, close, periods, shift, mode)
+
+
+def _tasks(frames, periods, shifts, chunk):
+    # uma tarefa por (ativo, deslocamento, bloco de períodos): os períodos de um
+    # bloco saem de uma única chamada a hilo_2d
+    for ticker in frames:
+        ticker_periods = list(periods[ticker] if isinstance(periods, dict) else periods)
+        for shift in shifts:
+            for i in range(0, len(ticker_periods), chunk):
+                yield ticker, shift, ticker_periods[i:i + chunk]
+
+
+def iter_hilo_jobs(frames, periods, shifts=(1,), max_workers=None, chunk=COLUMN_LOOP_MAX, mode='ema'):
+    """Calcula o Hilo de cada (ativo, período, deslocamento) e entrega as linhas conforme ficam prontas.
+
+    ``frames`` é ``{ticker: df}`` e ``periods`` é uma lista comum a todos ou
+    ``{ticker: períodos}``. A ordem de saída é a de conclusão das tarefas, não
+    a de entrada. Com ``max_workers=1`` tudo roda no próprio processo.
+    """
+    frames = {ticker: df for ticker, df in frames.items() if len(df)}
+    shifts = list(shifts)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1:
+        for ticker, shift, chunk_periods in _tasks(frames, periods, shifts, chunk):
+            df = frames[ticker]
+            yield from summarize_columns(ticker, df['high'].values, df['low'].values, df['close'].values,
+                                         chunk_periods, shift, mode)
+        return
+
+    with SharedCandles(frames) as shared, ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_run_task, (shared.name, shared.total, ticker, *shared.spans[ticker], shift, chunk_periods,
+                                    mode))
+            for ticker, shift, chunk_periods in _tasks(frames, periods, shifts, chunk)
+        ]
+        try:
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def compute_hilo_grid(frames, periods, shifts=(1,), max_workers=None, chunk=COLUMN_LOOP_MAX, mode='ema'):
+    """Versão em tabela de ``iter_hilo_jobs``, ordenada por ativo, período e deslocamento."""
+    rows = list(iter_hilo_jobs(frames, periods, shifts, max_workers, chunk, mode))
+    table = pd.DataFrame(rows, columns=ENGINE_COLUMNS)
+    return table.sort_values(['ticker', 'period', 'shift'], ignore_index=True)
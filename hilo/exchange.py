@@ -0,0 +1,149 @@
+import importlib.util
+import sys
+import threading
+import time
+import types
+
+# o pacote ``ccxt`` provisório não pode ser visto por outra thread
+_import_lock = threading.Lock()
+
+
+def binance_class():
+    """Classe ``binance`` do ccxt sem carregar as outras ~100 exchanges.
+
+    O ``ccxt/__init__`` importa todas as exchanges, mas ``ccxt.binance`` só
+    depende de ``ccxt.base`` e ``ccxt.abstract``: um pacote ``ccxt`` vazio fica
+    em ``sys.modules`` só durante o import do submódulo. Um ``import ccxt``
+    posterior carrega o pacote completo normalmente e reaproveita os mesmos
+    módulos (e as mesmas classes de erro). Se o import parcial falhar (outra
+    versão do ccxt, dependência nova), os submódulos carregados sob o pacote
+    vazio são descartados e vale o ``import ccxt`` completo.
+    """
+    with _import_lock:
+        if 'ccxt' not in sys.modules:
+            spec = importlib.util.find_spec('ccxt')
+            if spec is not None and spec.submodule_search_locations is not None:
+                before = set(sys.modules)
+                package = types.ModuleType('ccxt')
+                package.__path__ = list(spec.submodule_search_locations)
+                package.__spec__ = spec
+                sys.modules['ccxt'] = package
+                try:
+                    from ccxt.binance import binance
+                    return binance
+                except ImportError:
+                    for name in set(sys.modules) - before:
+                        if name.startswith('ccxt.'):
+                            del sys.modules[name]
+                finally:
+                    del sys.modules['ccxt']
+        import ccxt
+
+        return ccxt.binance
+
+
+def create_binance_testnet():
+    exchange = binance_class()({
+        'enableRateLimit': True,
+        'options': {
+            'defaultType': 'future'
+        }
+    })
+    exchange.set_sandbox_mode(True)
+    return exchange
+
+
+class SharedExchange:
+    """Um único cliente ccxt por processo, compartilhado entre sessões e símbolos.
+
+    Mantém a sessão HTTP e os mercados carregados entre chamadas e troca o
+    limitador de taxa do cliente por um orçamento único e thread-safe: cada
+    requisição reserva o próximo horário livre, então threads concorrentes
+    nunca excedem ``rateLimit`` somadas. Os mercados são recarregados a cada
+    ``markets_ttl`` segundos, ou quando o ``MarketCatalog`` vence e chama
+    ``refresh``; a recarga vai à rede fora do lock, e as outras threads seguem
+    com os mercados atuais enquanto isso.
+    """
+
+    def __init__(self, factory=create_binance_testnet, markets_ttl=3600):
+        self.factory = factory
+        self.markets_ttl = markets_ttl
+        self.created = 0
+        self.reused = 0
+        self.refreshed = 0
+        self.throttled = 0
+        self._client = None
+        self._markets_checked_at = 0.0
+        self._lock = threading.Lock()
+        self._slot_lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def get(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self._create()
+                return self._client
+            stale = time.monotonic() - self._markets_checked_at > self.markets_ttl
+            if stale:
+                # só esta thread recarrega; as demais não esperam pela rede
+                self._markets_checked_at = time.monotonic()
+            else:
+                self.reused += 1
+            client = self._client
+        if stale:
+            try:
+                self._reload_markets(client)
+            except Exception:
+                # mercados antigos continuam valendo até a próxima tentativa
+                pass
+        return client
+
+    def refresh(self):
+        """Recarrega os mercados agora e os devolve (usado pelo ``MarketCatalog`` ao vencer)."""
+        with self._lock:
+            if self._client is None:
+                # ``_create`` acabou de carregar os mercados: devolve os mesmos
+                self._client = self._create()
+                return self._client.load_markets()
+            self._markets_checked_at = time.monotonic()
+            client = self._client
+        return self._reload_markets(client)
+
+    def stats(self):
+        return {
+            'created': self.created,
+            'reused': self.reused,
+            'refreshed': self.refreshed,
+            'throttled': self.throttled,
+        }
+
+    def _create(self):
+        client = self.factory()
+        client.throttle = lambda cost=None: self._throttle(client, cost)
+        try:
+            # uma carga só, sob o lock, antes de o cliente ser compartilhado; sem
+            # ela as threads do scanner chamariam ``load_markets`` ao mesmo tempo
+            client.load_markets()
+        except Exception:
+            # o ccxt tenta de novo na primeira requisição que precisar dos mercados
+            pass
+        self.created += 1
+        self._markets_checked_at = time.monotonic()
+        return client
+
+    def _reload_markets(self, client):
+        markets = client.load_markets(reload=True)
+        with self._lock:
+            self.refreshed += 1
+        return markets
+
+    def _throttle(self, client, cost=None):
+        interval = client.rateLimit * (1 if cost is None else cost) / 1000
+        with self._slot_lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + interval
+            if slot > now:
+                self.throttled += 1
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,47 @@
+import numpy as np
+
+from .kernels import ema_2d, hilo_2d, moving_average_2d
+
+
+def ema(data, period):
+    """EMA semeada com o primeiro valor, como o ``ema()`` original em lista."""
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) == 0:
+        return np.empty(0, dtype=np.float64)
+    # a recorrência roda compilada quando há numba (ver ``kernels``), com a
+    # mesma ordem de operações do original (alpha * x + (1 - alpha) * anterior)
+    return ema_2d(data, period)[:, 0]
+
+
+def moving_average(data, period, mode='ema'):
+    """Média móvel 1D no modo ``ema``, ``sma`` ou ``wilder`` (ver ``moving_average_2d``)."""
+    data = np.asarray(data, dtype=np.float64)
+    if len(data) == 0:
+        return np.empty(0, dtype=np.float64)
+    return moving_average_2d(data, period, mode)[:, 0]
+
+
+def hilo_kernel(high, low, close, period, shift=1, mode='ema'):
+    """Hilo Activator sobre arrays float64; devolve ``(hilo, position)``.
+
+    Resultado idêntico bit a bit a ``hilo_activator_refactored``: as
+    ``period + shift - 1`` primeiras barras ficam com hilo NaN e posição 0, e
+    o empate entre as médias é decidido pelo fechamento anterior. ``mode``
+    troca a EMA das máximas/mínimas por ``sma`` ou ``wilder``.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if len(close) < period + shift:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.int64)
+    hilo, position = hilo_2d(high, low, close, period, shift, mode)
+    return hilo[:, 0], position[:, 0]
+
+
+def hilo_activator_refactored(df, period, shift=1, mode='ema'):
+    # pandas só é carregado aqui: ``ema`` e ``hilo_kernel`` dependem apenas do NumPy
+    import pandas as pd
+
+    if len(df) < period + shift:
+        return pd.Series(dtype=float), pd.Series(dtype=int)
+
+    hilo, position = hilo_kernel(df['high'].values, df['low'].values, df['close'].values, period, shift, mode)
+    return pd.Series(hilo, name='hilo'), pd.Series(position, name='position')
@@ -0,0 +1,257 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .data import OHLCV_COLUMNS
+from .state import HiloState
+
+BINANCE_FUTURES_TESTNET_WS = 'wss://stream.binancefuture.com/ws'
+RING_CAPACITY = 5000
+# Hilos (período, deslocamento, média) mantidos por stream; o menos lido sai primeiro
+MAX_STATES = 8
+# um stream sem leitura (``seed``/``snapshot``) nem ouvintes por este tempo (s) é desassinado
+IDLE_TIMEOUT = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+def stream_name(symbol, timeframe):
+    return f"{symbol.replace('/', '').lower()}@kline_{timeframe}"
+
+
+def parse_kline(message):
+    """Mensagem de kline da Binance → ``([ts, o, h, l, c, v], fechado)``."""
+    k = message['k']
+    row = [int(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v'])]
+    return row, bool(k['x'])
+
+
+class CandleRing:
+    """Buffer circular de candles fechados com capacidade fixa (arrays float64)."""
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self._data = np.empty((capacity, 6), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, row):
+        if self._size and row[0] <= self._data[(self._start + self._size - 1) % self.capacity, 0]:
+            return False
+        self._data[(self._start + self._size) % self.capacity] = row
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+        return True
+
+    def last(self):
+        if not self._size:
+            return None
+        return self._data[(self._start + self._size - 1) % self.capacity]
+
+    def to_array(self):
+        idx = (self._start + np.arange(self._size)) % self.capacity
+        return self._data[idx]
+
+
+class LiveStream:
+    """Estado ao vivo de um (símbolo, timeframe): anel de candles, candle em formação e Hilos.
+
+    Guarda no máximo ``max_states`` Hilos; ao registrar mais um, sai o lido há
+    mais tempo, exceto os de ``pinned`` (ex.: os vigiados por ``FlipAlerts``).
+    """
+
+    def __init__(self, symbol, timeframe, capacity=RING_CAPACITY, max_states=MAX_STATES):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.ring = CandleRing(capacity)
+        self.current = None
+        self.states = OrderedDict()
+        self.max_states = max_states
+        self.pinned = set()
+        self.updated_at = None
+        self.latency = None
+        self.read_at = time.monotonic()
+        # chamados como ``listener(stream, row)`` a cada candle fechado novo, ainda com o lock;
+        # uma exceção num ouvinte é registrada no log e não afeta os demais
+        self.listeners = []
+        self.lock = threading.Lock()
+
+    def seed(self, df, period, shift=1, mode='ema'):
+        """Semeia o anel com o histórico REST (passe só candles fechados) e registra um Hilo.
+
+        O Hilo ``(period, shift, mode)`` é sempre calculado sobre o conteúdo do anel,
+        então um Hilo registrado depois continua alinhado com os candles já
+        recebidos pelo WebSocket. Candles que chegaram pelo WebSocket antes da
+        semente ficam depois do histórico, e os Hilos já registrados são refeitos.
+        """
+        with self.lock:
+            if len(self.ring) < self.ring.capacity:
+                timestamps = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+                rows = np.column_stack([timestamps, df[['open', 'high', 'low', 'close', 'volume']].to_numpy(np.float64)])
+                received = self.ring.to_array()
+                older = rows[rows[:, 0] < received[0, 0]] if len(received) else rows
+                if len(older):
+                    self.ring = CandleRing(self.ring.capacity)
+                    for row in np.concatenate([older, received])[-self.ring.capacity:]:
+                        self.ring.append(row)
+                    history = pd.DataFrame(self.ring.to_array(), columns=OHLCV_COLUMNS)
+                    self.states = OrderedDict((key, HiloState.from_history(history, *key)) for key in self.states)
+            self.read_at = time.monotonic()
+            key = (period, shift, mode)
+            if key in self.states:
+                self.states.move_to_end(key)
+                return
+            history = pd.DataFrame(self.ring.to_array(), columns=OHLCV_COLUMNS)
+            self.states[key] = HiloState.from_history(history, period, shift, mode)
+            evictable = [other for other in self.states if other not in self.pinned and other != key]
+            for other in evictable[:max(0, len(self.states) - self.max_states)]:
+                del self.states[other]
+
+    def on_kline(self, row, closed, event_time=None):
+        with self.lock:
+            self.updated_at = time.time()
+            if event_time is not None:
+                self.latency = self.updated_at - event_time / 1000
+            if not closed:
+                self.current = row
+                return
+            self.current = None
+            self._append(row, list(self.states.values()))
+
+    def _append(self, row, states):
+        if self.ring.append(row):
+            candle = {'timestamp': row[0], 'high': row[2], 'low': row[3], 'close': row[4]}
+            for state in states:
+                state.update(candle)
+            for listener in self.listeners:
+                try:
+                    listener(self, row)
+                except Exception:
+                    logger.exception("ouvinte de %s %s falhou", self.symbol, self.timeframe)
+
+    def on_klines(self, rows):
+        """Vários candles fechados de uma vez (ex.: replay), com uma única aquisição do lock."""
+        with self.lock:
+            self.updated_at = time.time()
+            self.current = None
+            states = list(self.states.values())
+            for row in rows:
+                self._append(row, states)
+
+    def snapshot(self, period, shift=1, mode='ema'):
+        """Último candle (em formação, se houver) e o Hilo do último candle fechado."""
+        with self.lock:
+            self.read_at = time.monotonic()
+            state = self.states.get((period, shift, mode))
+            if state is not None:
+                self.states.move_to_end((period, shift, mode))
+            last = self.current if self.current is not None else self.ring.last()
+            return {
+                'candle': None if last is None else [float(x) for x in last],
+                'closed': self.current is None,
+                'hilo': None if state is None else state.hilo,
+                'position': None if state is None else state.position,
+                'updated_at': self.updated_at,
+                'latency': self.latency,
+            }
+
+
+def idle_streams(streams, idle_timeout):
+    """Chaves dos streams sem leitura há mais de ``idle_timeout`` s e sem ouvintes."""
+    now = time.monotonic()
+    return [key for key, stream in list(streams.items())
+            if not stream.listeners and now - stream.read_at > idle_timeout]
+
+
+class LiveFeed:
+    """Assinante de klines via WebSocket rodando num laço asyncio em segundo plano.
+
+    Uma conexão por (símbolo, timeframe), reconectando com backoff só após
+    erros de conexão. Os dados ficam em ``LiveStream`` compartilhados por
+    todas as sessões do processo; streams que ninguém lê há ``idle_timeout``
+    segundos (``None`` desliga) são desassinados e a conexão é fechada.
+    """
+
+    def __init__(self, url=BINANCE_FUTURES_TESTNET_WS, reconnect_delay=1.0, max_reconnect_delay=30.0,
+                 idle_timeout=IDLE_TIMEOUT):
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.idle_timeout = idle_timeout
+        self.streams = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='hilo-live-feed', daemon=True)
+        self._thread.start()
+        if idle_timeout is not None:
+            asyncio.run_coroutine_threadsafe(self._prune(), self._loop)
+
+    def subscribe(self, symbol, timeframe):
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self.streams:
+                self.streams[key] = LiveStream(symbol, timeframe)
+                future = asyncio.run_coroutine_threadsafe(self._listen(self.streams[key]), self._loop)
+                self._tasks[key] = future
+            return self.streams[key]
+
+    def unsubscribe(self, symbol, timeframe):
+        with self._lock:
+            future = self._tasks.pop((symbol, timeframe), None)
+            self.streams.pop((symbol, timeframe), None)
+        if future is not None:
+            future.cancel()
+
+    def prune(self):
+        """Desassina os streams ociosos; devolve quantos saíram."""
+        with self._lock:
+            idle = idle_streams(self.streams, self.idle_timeout)
+        for key in idle:
+            self.unsubscribe(*key)
+        return len(idle)
+
+    def close(self):
+        for key in list(self._tasks):
+            self.unsubscribe(*key)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+    async def _prune(self):
+        while True:
+            await asyncio.sleep(self.idle_timeout / 4)
+            self.prune()
+
+    async def _listen(self, stream):
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import WebSocketException
+
+        url = f"{self.url}/{stream_name(stream.symbol, stream.timeframe)}"
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with connect(url) as ws:
+                    delay = self.reconnect_delay
+                    async for raw in ws:
+                        try:
+                            message = json.loads(raw)
+                            if message.get('e') != 'kline':
+                                continue
+                            row, closed = parse_kline(message)
+                        except (ValueError, KeyError, TypeError):
+                            logger.warning("mensagem inválida em %s: %.200s", url, raw)
+                            continue
+                        stream.on_kline(row, closed, message.get('E'))
+            except (OSError, asyncio.TimeoutError, WebSocketException):
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_reconnect_delay)
@@ -0,0 +1,147 @@
+import json
+import math
+import os
+import threading
+import time
+
+from .store import DEFAULT_ROOT
+
+# metadados de mercado mudam pouco: um dia de validade no disco
+MARKETS_TTL = 24 * 3600
+# depois de uma falha sem arquivo salvo, espera antes de tentar de novo
+RETRY_DELAY = 60
+
+
+def _tick_size(market):
+    # a Binance informa o tick no filtro PRICE_FILTER; sem ele, o ccxt pode
+    # trazer a precisão como tick (0.01) ou como número de casas (2)
+    for item in (market.get('info') or {}).get('filters', []):
+        if item.get('filterType') == 'PRICE_FILTER' and item.get('tickSize'):
+            return float(item['tickSize'])
+    price = (market.get('precision') or {}).get('price')
+    if price is None:
+        return None
+    return float(price) if price < 1 or price != int(price) else 10.0 ** -price
+
+
+def market_record(market):
+    """Subconjunto de um mercado do ccxt que vale a pena guardar em disco."""
+    limits = market.get('limits') or {}
+    tick = _tick_size(market)
+    return {
+        'ticker': f"{market['base']}/{market['quote']}",
+        'symbol': market['symbol'],
+        'id': market['id'],
+        'type': market.get('type'),
+        'active': market.get('active') is not False,
+        'tick_size': tick,
+        'price_decimals': max(0, -math.floor(math.log10(tick) + 1e-9)) if tick else None,
+        'amount_step': (market.get('precision') or {}).get('amount'),
+        'min_amount': (limits.get('amount') or {}).get('min'),
+        'min_notional': (limits.get('cost') or {}).get('min'),
+    }
+
+
+class MarketCatalog:
+    """Catálogo de mercados da exchange, carregado uma vez e guardado em disco.
+
+    ``load`` devolve a lista de mercados do ccxt (``exchange.load_markets``);
+    só os do tipo ``market_type`` com liquidação na moeda cotada (futuros
+    lineares, os usados pelo app) entram no catálogo, indexados pelo ticker
+    do app (``BTC/USDT``), pelo símbolo do ccxt e pelo id da exchange. O
+    arquivo vale ``ttl`` segundos; se a exchange falhar, um arquivo vencido
+    continua valendo até a próxima tentativa. Com ``persist=False`` (fontes
+    locais, como o replay) nada é lido nem gravado em disco: o catálogo vem
+    sempre da fonte carregada no processo.
+    """
+
+    def __init__(self, load, name='binance-testnet', market_type='swap', root=None, ttl=MARKETS_TTL, persist=True):
+        self.load = load
+        self.market_type = market_type
+        self.ttl = ttl
+        self.path = os.path.join(root or DEFAULT_ROOT, 'markets', f'{name}-{market_type}.json') if persist else None
+        self.saved_at = None
+        self._retry_at = 0.0
+        self._by_ticker = None
+        self._by_key = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self._by_ticker is not None
+
+    def records(self):
+        with self._lock:
+            if (self._by_ticker is None or self._expired()) and time.time() >= self._retry_at:
+                self._refresh()
+            return self._by_ticker or {}
+
+    def get(self, ticker):
+        """Metadados por ticker do app, símbolo do ccxt ou id da exchange (``None`` se não existir)."""
+        records = self.records()
+        return records.get(ticker) or self._by_key.get(ticker)
+
+    def is_valid(self, ticker):
+        """``True``/``False`` se o catálogo conhece o mercado; ``None`` se não há catálogo."""
+        records = self.records()
+        if not self.loaded:
+            return None
+        record = records.get(ticker) or self._by_key.get(ticker)
+        return record is not None and record['active']
+
+    def invalid(self, assets):
+        """Tickers de ``assets`` sem mercado ativo (vazio quando o catálogo não pôde ser carregado)."""
+        return {asset['ticker'] for asset in assets if self.is_valid(asset['ticker']) is False}
+
+    def format_price(self, ticker, value):
+        """Preço com as casas decimais do tick do mercado (4 casas se desconhecido)."""
+        record = self.get(ticker)
+        decimals = record['price_decimals'] if record and record['price_decimals'] is not None else 4
+        return f"{value:.{decimals}f}"
+
+    def _expired(self):
+        return self.saved_at is None or time.time() - self.saved_at > self.ttl
+
+    def _refresh(self):
+        saved = self._read()
+        if saved is not None and time.time() - saved['saved_at'] <= self.ttl:
+            self._index(saved['markets'], saved['saved_at'])
+            return
+        try:
+            markets = self.load()
+        except Exception:
+            self._retry_at = time.time() + RETRY_DELAY
+            if saved is not None:
+                self._index(saved['markets'], saved['saved_at'])
+            return
+        values = markets.values() if isinstance(markets, dict) else markets
+        records = [market_record(market) for market in values
+                   if market.get('type') == self.market_type and market.get('settle', market['quote']) == market['quote']]
+        self._index(records, time.time())
+        self._write(records)
+
+    def _index(self, records, saved_at):
+        self.saved_at = saved_at
+        self._by_ticker = {record['ticker']: record for record in records}
+        self._by_key = {}
+        for record in records:
+            self._by_key[record['symbol']] = record
+            self._by_key[record['id']] = record
+
+    def _read(self):
+        if self.path is None:
+            return None
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, records):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'saved_at': self.saved_at, 'markets': records}, f)
+        os.replace(tmp, self.path)
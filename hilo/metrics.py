@@ -0,0 +1,115 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Registro de métricas em memória, thread-safe, exportável no formato do Prometheus.
+
+    ``timer(stage)`` acumula contagem, soma e máximo de duração por etapa;
+    ``count`` incrementa contadores e ``gauge`` guarda o último valor. Se
+    ``run`` (um dict) for passado, a duração também é gravada nele, o que
+    permite mostrar os tempos da execução atual.
+    """
+
+    def __init__(self, prefix='hilo'):
+        self.prefix = prefix
+        self._stages = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, stage, run=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, run)
+
+    def observe(self, stage, seconds, run=None):
+        with self._lock:
+            count, total, peak = self._stages.get(stage, (0, 0.0, 0.0))
+            self._stages[stage] = (count + 1, total + seconds, max(peak, seconds))
+        if run is not None:
+            run[stage] = run.get(stage, 0.0) + seconds
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'stages': {stage: {'count': c, 'sum': s, 'max': m} for stage, (c, s, m) in self._stages.items()},
+                'counters': {_label_key(k): v for k, v in self._counters.items()},
+                'gauges': {_label_key(k): v for k, v in self._gauges.items()},
+            }
+
+    def to_prometheus(self):
+        p = self.prefix
+        lines = [f'# TYPE {p}_stage_seconds summary']
+        with self._lock:
+            for stage, (count, total, _) in sorted(self._stages.items()):
+                lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+                lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {count}')
+            lines.append(f'# TYPE {p}_stage_seconds_max gauge')
+            for stage, (_, _, peak) in sorted(self._stages.items()):
+                lines.append(f'{p}_stage_seconds_max{{stage="{stage}"}} {peak:.6f}')
+            for (name, labels), value in sorted(self._counters.items()):
+                lines.append(f'{p}_{name}_total{_labels(labels)} {value}')
+            for (name, labels), value in sorted(self._gauges.items()):
+                lines.append(f'{p}_{name}{_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels) + '}'
+
+
+def _label_key(key):
+    name, labels = key
+    return name + _labels(labels)
+
+
+def append_log(path, record):
+    """Acrescenta um registro JSON por linha (fácil de coletar por agentes de log)."""
+    with open(path, 'a') as f:
+        f.write(json.dumps(record, default=str) + '\n')
+
+
+def start_http_server(registry, port, host='127.0.0.1'):
+    """Serve ``/metrics`` no formato texto do Prometheus numa thread em segundo plano."""
+    # http.server (e o pacote email que ele puxa) só quando o endpoint é ligado
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = registry.to_prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name='hilo-metrics', daemon=True).start()
+    return server
+
+
+# registro padrão do processo, usado pelo pacote e pelo app
+metrics = Metrics()
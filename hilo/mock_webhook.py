@@ -0,0 +1,63 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class MockWebhookServer:
+    """Servidor HTTP local que recebe os POSTs de ``WebhookSink``.
+
+    Guarda o corpo JSON de cada requisição em ``received``; use como
+    substituto do webhook real em testes e demonstrações::
+
+        with MockWebhookServer() as server:
+            alerts = FlipAlerts(assets, '5m', sinks=[WebhookSink(server.url)])
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, status=200):
+        self.host = host
+        self.port = port
+        self.status = status
+        self.received = []
+        self._server = None
+        self._changed = threading.Condition()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/alerts"
+
+    def wait(self, count=1, timeout=5):
+        """Espera até ``count`` requisições terem chegado; devolve se chegaram."""
+        with self._changed:
+            return self._changed.wait_for(lambda: len(self.received) >= count, timeout)
+
+    def start(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with mock._changed:
+                    mock.received.append(json.loads(body or b'null'))
+                    mock._changed.notify_all()
+                self.send_response(mock.status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name='hilo-mock-webhook', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
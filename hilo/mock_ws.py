@@ -0,0 +1,83 @@
+import asyncio
+import json
+import threading
+import time
+
+
+def kline_message(symbol, timeframe, row, closed, timeframe_ms=None):
+    ts, o, h, l, c, v = row
+    return {
+        'e': 'kline',
+        'E': int(time.time() * 1000),
+        's': symbol.replace('/', '').upper(),
+        'k': {
+            't': int(ts),
+            'T': int(ts) + (timeframe_ms or 0) - 1,
+            's': symbol.replace('/', '').upper(),
+            'i': timeframe,
+            'o': str(o), 'h': str(h), 'l': str(l), 'c': str(c), 'v': str(v),
+            'x': closed,
+        },
+    }
+
+
+class MockKlineServer:
+    """Servidor WebSocket local que imita o stream de klines da Binance.
+
+    Para cada linha OHLCV de ``rows`` envia uma atualização em formação e em
+    seguida o candle fechado, com ``interval`` segundos entre candles. Use
+    como substituto do exchange em testes e demonstrações::
+
+        with MockKlineServer(rows) as server:
+            feed = LiveFeed(url=server.url)
+    """
+
+    def __init__(self, rows, symbol='BTC/USDT', timeframe='5m', interval=0.01, host='127.0.0.1', port=0):
+        self.rows = rows
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.interval = interval
+        self.host = host
+        self.port = port
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}/ws"
+
+    async def _handler(self, ws):
+        for row in self.rows:
+            await ws.send(json.dumps(kline_message(self.symbol, self.timeframe, row, False)))
+            await ws.send(json.dumps(kline_message(self.symbol, self.timeframe, row, True)))
+            await asyncio.sleep(self.interval)
+        await ws.wait_closed()
+
+    async def _start(self):
+        from websockets.asyncio.server import serve
+
+        self._server = await serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='hilo-mock-ws', daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop)
+        self._ready.wait(5)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.close()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,232 @@
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import metrics
+
+# chaves guardadas no ``RefreshingCache``; ``limit`` faz parte da chave, então sem
+# limite cada posição do slider ficaria na memória para sempre
+DEFAULT_MAX_ENTRIES = 64
+
+
+class CircuitOpen(Exception):
+    """O disjuntor da chave está aberto: nenhuma chamada à exchange foi feita."""
+
+
+class CircuitBreaker:
+    """Disjuntor: abre depois de ``threshold`` falhas seguidas.
+
+    Aberto, recusa chamadas por ``cooldown`` segundos; depois deixa passar uma
+    única tentativa (meio aberto), que fecha o disjuntor se der certo ou o
+    reabre se falhar.
+    """
+
+    def __init__(self, threshold=3, cooldown=60.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        return 'half-open' if self._probing or self.retry_in() == 0 else 'open'
+
+    def retry_in(self):
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self._probing or self.retry_in() > 0:
+                return False
+            self._probing = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def retry(call, retries=3, backoff=0.5, max_backoff=8.0):
+    """Chama ``call`` até ``retries`` vezes a mais, com espera exponencial e jitter entre as tentativas."""
+    for attempt in range(retries + 1):
+        try:
+            return call()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(min(max_backoff, backoff * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+class _Entry:
+    __slots__ = ('value', 'fetched_at', 'error')
+
+    def __init__(self):
+        self.value = None
+        self.fetched_at = None
+        self.error = None
+
+
+class RefreshingCache:
+    """Cache "stale-while-revalidate" de ``fetch(*key)``.
+
+    Um valor mais velho que ``ttl`` continua sendo servido na hora, enquanto
+    uma thread em segundo plano busca o novo; se a busca falhar, o último
+    valor bom fica. Só a primeira busca de uma chave bloqueia quem pediu.
+    Cada busca é repetida com espera exponencial, e um disjuntor por
+    ``breaker_key(key)`` (o símbolo, por padrão) suspende as chamadas de um
+    símbolo que só falha. Só as ``max_entries`` chaves usadas mais
+    recentemente ficam guardadas; a mais antiga sai junto com o seu lock e,
+    se nenhuma outra chave o usa, o seu disjuntor.
+    """
+
+    def __init__(self, fetch, ttl=3600, max_workers=4, retries=3, backoff=0.5, failure_threshold=3, cooldown=60.0,
+                 breaker_key=lambda key: key[0], name='data', max_entries=DEFAULT_MAX_ENTRIES):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.retries = retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.breaker_key = breaker_key
+        self.name = name
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._breakers = {}
+        self._key_locks = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'hilo-{name}-refresh')
+
+    def get(self, *key):
+        """Valor da chave: guardado (mesmo velho) ou, na primeira vez, buscado agora."""
+        return self.lookup(*key)[0]
+
+    def lookup(self, *key):
+        """Como ``get``, mas devolve ``(valor, resultado)``, com ``'hit'``, ``'stale'`` ou ``'miss'``.
+
+        O resultado é o desta chamada, ao contrário dos contadores de
+        ``metrics``, que somam todas as sessões e as atualizações em segundo plano.
+        """
+        entry = self._entry(key)
+        if entry.value is not None:
+            result = 'stale' if time.time() - entry.fetched_at > self.ttl else 'hit'
+            if result == 'stale':
+                self._schedule(key)
+            metrics.count(f'{self.name}_cache', result=result)
+            return entry.value, result
+        with self._key_lock(key):
+            # outra sessão pode ter buscado enquanto esperávamos
+            if entry.value is not None:
+                metrics.count(f'{self.name}_cache', result='hit')
+                return entry.value, 'hit'
+            metrics.count(f'{self.name}_cache', result='miss')
+            return self._refresh(key), 'miss'
+
+    def status(self, *key):
+        """Idade, erro e estado do disjuntor da chave, para mostrar na interface (não cria a chave)."""
+        with self._lock:
+            entry = self._entries.get(key) or _Entry()
+            breaker = self._breakers.get(self.breaker_key(key))
+            refreshing = key in self._refreshing
+        age = None if entry.fetched_at is None else time.time() - entry.fetched_at
+        return {
+            'fetched_at': entry.fetched_at,
+            'age': age,
+            'stale': age is not None and age > self.ttl,
+            'refreshing': refreshing,
+            'error': entry.error,
+            'circuit': 'closed' if breaker is None else breaker.state,
+            'retry_in': 0.0 if breaker is None else breaker.retry_in(),
+        }
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'refreshing': len(self._refreshing),
+                'open_circuits': sorted(str(k) for k, b in self._breakers.items() if b.state != 'closed'),
+            }
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                self._evict()
+            else:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _evict(self):
+        # chaves em atualização ficam; as demais saem da menos usada para a mais usada
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_entries:
+                break
+            if key in self._refreshing:
+                continue
+            del self._entries[key]
+            self._key_locks.pop(key, None)
+            breaker_key = self.breaker_key(key)
+            if not any(self.breaker_key(other) == breaker_key for other in self._entries):
+                self._breakers.pop(breaker_key, None)
+
+    def _breaker(self, key):
+        with self._lock:
+            return self._breakers.setdefault(self.breaker_key(key),
+                                             CircuitBreaker(self.failure_threshold, self.cooldown))
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _refresh(self, key):
+        entry = self._entry(key)
+        breaker = self._breaker(key)
+        if not breaker.allow():
+            raise CircuitOpen(f"muitas falhas seguidas; nova tentativa em {breaker.retry_in():.0f} s")
+        try:
+            value = retry(lambda: self.fetch(*key), self.retries, self.backoff)
+        except Exception as e:
+            breaker.failure()
+            entry.error = str(e)
+            metrics.count(f'{self.name}_refresh', result='error')
+            raise
+        breaker.success()
+        entry.value, entry.fetched_at, entry.error = value, time.time(), None
+        metrics.count(f'{self.name}_refresh', result='ok')
+        return value
+
+    def _schedule(self, key):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        self._pool.submit(self._refresh_in_background, key)
+
+    def _refresh_in_background(self, key):
+        try:
+            self._refresh(key)
+        except Exception:
+            pass  # o erro fica em ``status``; o valor antigo continua valendo
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .data import PAGE_LIMIT
+
+
+BASE_TIMEFRAME = '5m'
+MAX_BASE_CANDLES = 200_000
+_UNITS_MS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+# a época (01/01/1970) caiu numa quinta; as semanas da Binance abrem na segunda
+WEEK_ORIGIN_MS = -3 * 86_400_000
+
+
+def parse_timeframe_ms(timeframe):
+    return int(timeframe[:-1]) * _UNITS_MS[timeframe[-1]]
+
+
+def format_timeframe(step_ms):
+    """Inverso de ``parse_timeframe_ms``: 300000 → ``'5m'`` (na maior unidade exata)."""
+    for unit, ms in sorted(_UNITS_MS.items(), key=lambda item: -item[1]):
+        if step_ms % ms == 0:
+            return f"{step_ms // ms}{unit}"
+    raise ValueError(f"Intervalo sem timeframe correspondente: {step_ms} ms")
+
+
+def resample_arrays(timestamp, open, high, low, close, volume, timeframe, drop_partial=True):
+    """Agrega colunas OHLCV (timestamps int64 em ms) em ``timeframe``.
+
+    Os baldes são alinhados à época UTC, como na Binance, e os semanais à
+    segunda-feira 00:00 UTC: abertura do primeiro candle, máxima/mínima do
+    balde, fechamento do último e volume somado. Com ``drop_partial`` o primeiro balde é descartado se o histórico
+    começa no meio dele; o último balde fica como o candle em formação, igual
+    ao que o exchange devolveria.
+    """
+    step = parse_timeframe_ms(timeframe)
+    origin = WEEK_ORIGIN_MS if timeframe.endswith('w') else 0
+    buckets = (timestamp - origin) // step * step + origin
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[:1] - 1))
+    if drop_partial and len(starts) and timestamp[0] != buckets[0]:
+        starts = starts[1:]
+    if len(starts) == 0:
+        return buckets[:0], open[:0], high[:0], low[:0], close[:0], volume[:0]
+
+    ends = np.append(starts[1:], len(timestamp)) - 1
+    first = starts[0]
+    offsets = starts - first
+    return (
+        buckets[starts],
+        open[starts],
+        np.maximum.reduceat(high[first:], offsets),
+        np.minimum.reduceat(low[first:], offsets),
+        close[ends],
+        np.add.reduceat(volume[first:], offsets),
+    )
+
+
+def resample_ohlcv(df, timeframe, drop_partial=True):
+    """Versão DataFrame de ``resample_arrays``."""
+    timestamp = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+    columns = resample_arrays(timestamp, *(df[c].values for c in ('open', 'high', 'low', 'close', 'volume')),
+                              timeframe, drop_partial)
+    out = pd.DataFrame(dict(zip(['timestamp', 'open', 'high', 'low', 'close', 'volume'], columns)))
+    out['timestamp'] = pd.to_datetime(out['timestamp'], unit='ms')
+    return out
+
+
+class MultiTimeframeLoader:
+    """Deriva todos os timeframes de um único histórico em ``base_timeframe``.
+
+    Guarda em memória, por símbolo, o maior histórico base já carregado; um
+    pedido coberto por ele (e mais novo que ``ttl``) é só uma agregação em
+    memória, sem I/O de rede. ``fetch`` é ``fetch(symbol, timeframe, limit)``
+    e devolve ``Candles`` (ex.: ``ExchangeSource.fetch_candles``); ``load``
+    também devolve ``Candles`` e o DataFrame só é montado na exibição.
+
+    Derivar só compensa quando não custa mais requisições: 120 candles de 1d
+    são uma página direta, mas ~35 páginas de 5m. Com ``page_size`` (candles
+    por requisição; ``None`` para fontes locais), ``supports`` recusa o pedido
+    cujo histórico base ocupa mais páginas que a busca direta, a menos que o
+    histórico guardado do símbolo já o cubra.
+    """
+
+    def __init__(self, fetch, base_timeframe=BASE_TIMEFRAME, ttl=3600, max_base_candles=MAX_BASE_CANDLES,
+                 page_size=PAGE_LIMIT):
+        self.fetch = fetch
+        self.base_timeframe = base_timeframe
+        self.ttl = ttl
+        self.max_base_candles = max_base_candles
+        self.page_size = page_size
+        self._base = {}
+        self._lock = threading.Lock()
+
+    def base_limit(self, timeframe, limit):
+        # +1 balde para compensar um primeiro balde parcial descartado
+        ratio = parse_timeframe_ms(timeframe) // parse_timeframe_ms(self.base_timeframe)
+        return limit if ratio == 1 else (limit + 1) * ratio
+
+    def supports(self, timeframe, limit, symbol=None):
+        step = parse_timeframe_ms(timeframe)
+        base_step = parse_timeframe_ms(self.base_timeframe)
+        base_limit = self.base_limit(timeframe, limit)
+        if step < base_step or step % base_step or base_limit > self.max_base_candles:
+            return False
+        if self.page_size is None or -(-base_limit // self.page_size) <= -(-limit // self.page_size):
+            return True
+        with self._lock:
+            cached = self._base.get(symbol)
+        return cached is not None and cached[1] >= base_limit
+
+    def base(self, symbol, base_limit):
+        with self._lock:
+            cached = self._base.get(symbol)
+        if cached is not None:
+            candles, requested, loaded_at = cached
+            if requested >= base_limit and time.monotonic() - loaded_at < self.ttl:
+                return candles
+            # pede de novo o histórico maior já guardado, não um menor
+            base_limit = max(base_limit, requested)
+        candles = self.fetch(symbol, self.base_timeframe, base_limit)
+        if candles.empty:
+            return candles
+        with self._lock:
+            self._base[symbol] = (candles, base_limit, time.monotonic())
+        return candles
+
+    def base_request(self, symbol):
+        """Argumentos de ``fetch`` do histórico base guardado para ``symbol`` (``None`` se não houver)."""
+        with self._lock:
+            cached = self._base.get(symbol)
+        return None if cached is None else (symbol, self.base_timeframe, cached[1])
+
+    def load(self, symbol, timeframe, limit):
+        if timeframe == self.base_timeframe:
+            candles = self.base(symbol, limit)
+        else:
+            candles = self.base(symbol, self.base_limit(timeframe, limit)).resample(timeframe)
+        return candles.tail(limit)
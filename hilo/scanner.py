@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .data import fetch_ohlcv_frame
+from .indicators import hilo_kernel
+
+SCAN_COLUMNS = ['ticker', 'period', 'close', 'hilo', 'position', 'distance_pct', 'bars_since_flip', 'error']
+
+
+def bars_since_flip(position):
+    """Barras desde a última troca de posição (NaN se não houve troca na janela)."""
+    position = np.asarray(position)
+    valid = np.flatnonzero(position)
+    if len(valid) == 0:
+        return np.nan
+    flips = np.flatnonzero(position[valid[0] + 1:] != position[valid[0]:-1])
+    if len(flips) == 0:
+        return np.nan
+    return len(position) - 1 - (valid[0] + flips[-1] + 1)
+
+
+def summarize_hilo(ticker, period, df, shift=1, mode='ema'):
+    hilo, position = hilo_kernel(df['high'].values, df['low'].values, df['close'].values, period, shift, mode)
+    close = float(df['close'].iloc[-1]) if len(df) else np.nan
+    if len(hilo) == 0:
+        return {'ticker': ticker, 'period': period, 'close': close, 'hilo': np.nan, 'position': 0,
+                'distance_pct': np.nan, 'bars_since_flip': np.nan, 'error': 'histórico curto demais'}
+    return {
+        'ticker': ticker,
+        'period': period,
+        'close': close,
+        'hilo': hilo[-1],
+        'position': int(position[-1]),
+        'distance_pct': (close - hilo[-1]) / close * 100,
+        'bars_since_flip': bars_since_flip(position),
+        'error': None,
+    }
+
+
+def scan_assets(exchange, assets, timeframe, limit, shift=1, store=None, max_workers=8, mode='ema', catalog=None,
+                fetch=None):
+    """Busca todos os ativos em paralelo (pool limitado) e resume o Hilo de cada um.
+
+    Cada ativo usa o próprio ``period`` configurado. Falhas de busca viram uma
+    linha com ``error`` preenchido em vez de interromper o scan; ativos que o
+    ``catalog`` de mercados não conhece nem chegam a ser buscados. ``fetch``
+    (``fetch(symbol, timeframe, limit)``, ex.: ``ReplaySource.fetch``) substitui
+    a busca na exchange; nesse caso ``exchange`` pode ser ``None``.
+    """
+    def scan_one(asset):
+        if catalog is not None and catalog.is_valid(asset['ticker']) is False:
+            return {'ticker': asset['ticker'], 'period': asset['period'], 'error': 'mercado indisponível'}
+        try:
+            if fetch is not None:
+                df = fetch(asset['ticker'], timeframe, limit)
+            else:
+                df = fetch_ohlcv_frame(exchange, asset['ticker'], timeframe, limit, store=store)
+            return summarize_hilo(asset['ticker'], asset['period'], df, shift, mode)
+        except Exception as e:
+            return {'ticker': asset['ticker'], 'period': asset['period'], 'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        rows = list(pool.map(scan_one, assets))
+    return pd.DataFrame(rows, columns=SCAN_COLUMNS)
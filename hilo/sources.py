@@ -0,0 +1,323 @@
+"""Fontes de candles: a exchange ao vivo ou um arquivo reproduzido em velocidade acelerada.
+
+Uma fonte tem ``name`` (chave do catálogo de mercados em disco),
+``base_timeframe`` (menor timeframe entregue direto), ``remote`` (se cada
+busca vai à rede) e os métodos ``fetch(symbol, timeframe, limit)``, que
+devolve um DataFrame OHLCV, ``fetch_candles``, o mesmo como ``Candles``
+float32 (o formato guardado em cache), ``load_markets()``, no formato do ccxt, e
+``live_feed()``, um assinante com ``subscribe(symbol, timeframe)`` que
+entrega ``LiveStream``. ``ExchangeSource`` é o caminho padrão (ccxt +
+WebSocket); ``ReplaySource`` lê CSV/Parquet e libera os candles conforme um
+relógio simulado avança.
+"""
+import hashlib
+import math
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .candles import Candles
+from .data import fetch_candles, fetch_ohlcv_frame, ohlcv_to_frame
+from .exchange import SharedExchange
+from .live import IDLE_TIMEOUT, idle_streams
+from .resample import BASE_TIMEFRAME, format_timeframe, parse_timeframe_ms, resample_arrays
+
+REPLAY_EXTENSIONS = ('.csv', '.csv.gz', '.parquet')
+# candles já fechados quando o replay começa, para o gráfico e o Hilo terem histórico
+# (50k de 5m ≈ 170 candles diários); limitado à metade do arquivo
+REPLAY_WARMUP = 50_000
+REPLAY_SPEED = 60.0
+# intervalo (s) entre os avanços do ``ReplayFeed``
+REPLAY_INTERVAL = 0.05
+# candles por aquisição do lock do stream: o painel ao vivo não espera um lote inteiro
+REPLAY_BATCH = 10_000
+
+
+class ExchangeSource:
+    """Candles da exchange via ccxt, com o armazém local opcional; ao vivo pelo WebSocket."""
+
+    name = 'binance-testnet'
+    base_timeframe = BASE_TIMEFRAME
+    remote = True
+
+    def __init__(self, exchange=None, store=None, name=None):
+        self.exchange = exchange or SharedExchange()
+        self.store = store
+        if name is not None:
+            # outro cliente (produção, spot): outro nome, para não dividir armazém e catálogo
+            self.name = name
+
+    def fetch(self, symbol, timeframe, limit):
+        return fetch_ohlcv_frame(self.exchange.get(), symbol, timeframe, limit, store=self.store, name=self.name)
+
+    def fetch_candles(self, symbol, timeframe, limit):
+        return fetch_candles(self.exchange.get(), symbol, timeframe, limit, store=self.store, name=self.name)
+
+    def load_markets(self):
+        # o catálogo só chama ao vencer: a lista vem da rede, não da cópia do cliente
+        return self.exchange.refresh()
+
+    def live_feed(self):
+        from .live import LiveFeed
+
+        return LiveFeed()
+
+
+def _read_table(path):
+    return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+
+
+def _timestamps_ms(column):
+    if pd.api.types.is_numeric_dtype(column):
+        return column.to_numpy(np.int64)
+    parsed = pd.to_datetime(column, utc=True).dt.tz_localize(None)
+    return parsed.values.astype('datetime64[ms]').astype(np.int64)
+
+
+def _symbol_from_path(path):
+    name = os.path.basename(path)
+    for extension in REPLAY_EXTENSIONS:
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+    return name.replace('-', '/')
+
+
+def read_candles(path, symbol=None):
+    """Candles de um CSV/Parquet (ou de um diretório deles) como ``{símbolo: array (n, 6)}``.
+
+    Colunas ``timestamp`` (ms ou data) e ``open/high/low/close/volume``. O
+    símbolo vem da coluna ``ticker`` ou ``symbol`` quando existe (como na saída
+    de ``hilo signals --series``); senão, de ``symbol`` ou do nome do arquivo
+    (``BTC-USDT.parquet`` → ``BTC/USDT``). As linhas saem ordenadas por
+    timestamp, sem repetições.
+    """
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(REPLAY_EXTENSIONS))
+    else:
+        paths = [path]
+    parts = {}
+    for file in paths:
+        df = _read_table(file)
+        key = next((column for column in ('ticker', 'symbol') if column in df), None)
+        groups = df.groupby(key, sort=False) if key else [(symbol or _symbol_from_path(file), df)]
+        for name, group in groups:
+            rows = np.column_stack([_timestamps_ms(group['timestamp']),
+                                    group[['open', 'high', 'low', 'close', 'volume']].to_numpy(np.float64)])
+            parts.setdefault(name, []).append(rows)
+    candles = {}
+    for name, chunks in parts.items():
+        rows = np.concatenate(chunks)
+        rows = rows[np.argsort(rows[:, 0], kind='stable')]
+        # timestamp repetido: fica a última linha
+        keep = np.append(rows[1:, 0] != rows[:-1, 0], True)
+        candles[name] = rows[keep]
+    return candles
+
+
+class ReplayClock:
+    """Relógio simulado: a partir de ``start_ms``, avança ``speed`` ms de mercado por ms real.
+
+    ``speed=math.inf`` libera o histórico inteiro de uma vez.
+    """
+
+    def __init__(self, start_ms, speed=REPLAY_SPEED):
+        self.start_ms = start_ms
+        self.speed = speed
+        self._started = time.monotonic()
+
+    def now_ms(self):
+        if math.isinf(self.speed):
+            return math.inf
+        return self.start_ms + (time.monotonic() - self._started) * 1000 * self.speed
+
+
+class ReplaySource:
+    """Reproduz candles de arquivo como se chegassem da exchange, ``speed`` vezes mais rápido.
+
+    ``fetch`` devolve só os candles que já fecharam no relógio simulado (o
+    candle em formação não existe no arquivo); timeframes maiores que o do
+    arquivo saem agregados. O replay começa com ``warmup`` candles fechados
+    (no máximo metade do maior histórico), ou em ``start`` (data ou timestamp
+    em ms).
+    """
+
+    base_timeframe = None
+    remote = False
+
+    def __init__(self, path, speed=REPLAY_SPEED, start=None, warmup=REPLAY_WARMUP, symbol=None, timeframe=None):
+        self.path = path
+        self.candles = read_candles(path, symbol)
+        if not self.candles:
+            raise ValueError(f"Nenhum candle encontrado em {path}")
+        self.base_timeframe = timeframe or self._infer_timeframe()
+        self.step = parse_timeframe_ms(self.base_timeframe)
+        first = min(int(rows[0, 0]) for rows in self.candles.values())
+        if start is None:
+            longest = max(len(rows) for rows in self.candles.values())
+            start_ms = first + min(warmup, longest // 2) * self.step
+        elif isinstance(start, (int, float)):
+            start_ms = int(start)
+        else:
+            start_ms = pd.Timestamp(start).value // 1_000_000
+        self.end_ms = max(int(rows[-1, 0]) for rows in self.candles.values()) + self.step
+        self.clock = ReplayClock(start_ms, speed)
+        self.name = f"replay-{hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]}"
+        self._series = {}
+        self._lock = threading.Lock()
+
+    @property
+    def speed(self):
+        return self.clock.speed
+
+    def finished(self, symbols=None):
+        """Se o relógio já passou do último candle de ``symbols`` (padrão: todos os do arquivo)."""
+        symbols = self.candles if symbols is None else [symbol for symbol in symbols if symbol in self.candles]
+        return all(self.clock.now_ms() >= self.candles[symbol][-1, 0] + self.step for symbol in symbols)
+
+    def _infer_timeframe(self):
+        rows = max(self.candles.values(), key=len)
+        if len(rows) < 2:
+            raise ValueError("Informe o timeframe: o arquivo tem um único candle")
+        return format_timeframe(int(np.median(np.diff(rows[:, 0]))))
+
+    def series(self, symbol, timeframe=None):
+        """Todos os candles do arquivo em ``timeframe`` (agregados e guardados na primeira chamada)."""
+        timeframe = timeframe or self.base_timeframe
+        if symbol not in self.candles:
+            raise ValueError(f"Nenhum dado disponível para {symbol}")
+        if timeframe == self.base_timeframe:
+            return self.candles[symbol]
+        with self._lock:
+            rows = self._series.get((symbol, timeframe))
+            if rows is None:
+                step = parse_timeframe_ms(timeframe)
+                if step < self.step or step % self.step:
+                    raise ValueError(f"{timeframe} não é múltiplo do timeframe do arquivo ({self.base_timeframe})")
+                base = self.candles[symbol]
+                columns = resample_arrays(base[:, 0].astype(np.int64), *base[:, 1:].T, timeframe)
+                rows = self._series[(symbol, timeframe)] = np.column_stack(columns).astype(np.float64)
+            return rows
+
+    def closed_count(self, symbol, timeframe=None, now_ms=None):
+        """Quantos candles de ``series`` já fecharam no relógio simulado."""
+        timeframe = timeframe or self.base_timeframe
+        rows = self.series(symbol, timeframe)
+        now_ms = self.clock.now_ms() if now_ms is None else now_ms
+        return int(np.searchsorted(rows[:, 0], now_ms - parse_timeframe_ms(timeframe), side='right'))
+
+    def _closed_rows(self, symbol, timeframe, limit):
+        rows = self.series(symbol, timeframe)
+        end = self.closed_count(symbol, timeframe)
+        if end == 0:
+            raise ValueError(f"Nenhum dado disponível para {symbol}")
+        return rows[max(0, end - limit):end]
+
+    def fetch(self, symbol, timeframe, limit):
+        return ohlcv_to_frame(self._closed_rows(symbol, timeframe, limit))
+
+    def fetch_candles(self, symbol, timeframe, limit):
+        return Candles.from_ohlcv(self._closed_rows(symbol, timeframe, limit))
+
+    def load_markets(self):
+        markets = []
+        for symbol in self.candles:
+            base, _, quote = symbol.partition('/')
+            markets.append({'symbol': f"{symbol}:{quote}" if quote else symbol, 'id': symbol.replace('/', ''),
+                            'base': base, 'quote': quote, 'settle': quote, 'type': 'swap', 'active': True})
+        return markets
+
+    def live_feed(self):
+        return ReplayFeed(self)
+
+    def progress(self):
+        """Posição do relógio e candles já liberados por símbolo, para mostrar na interface."""
+        now = self.clock.now_ms()
+        return {
+            'clock': pd.Timestamp(min(now, self.end_ms), unit='ms'),
+            'speed': self.speed,
+            'finished': now >= self.end_ms,
+            'released': {symbol: f"{self.closed_count(symbol, now_ms=now)}/{len(rows)}"
+                         for symbol, rows in self.candles.items()},
+        }
+
+
+class ReplayFeed:
+    """Equivalente de ``LiveFeed`` para o replay: empurra os candles fechados para os ``LiveStream``.
+
+    Uma thread avança a cada ``interval`` segundos e entrega de uma vez, via
+    ``LiveStream.on_klines``, todos os candles que fecharam desde o último
+    avanço, alimentando os mesmos ``HiloState`` do modo ao vivo. Um stream só
+    começa a receber candles depois de semeado com o histórico. Com
+    ``autostart=False`` não há thread: quem usa chama ``advance`` (e
+    ``prune``, que desassina os streams ociosos como em ``LiveFeed``).
+    """
+
+    def __init__(self, source, interval=REPLAY_INTERVAL, autostart=True, idle_timeout=IDLE_TIMEOUT):
+        self.source = source
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.streams = {}
+        self.delivered = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if autostart:
+            self._thread = threading.Thread(target=self._run, name='hilo-replay-feed', daemon=True)
+            self._thread.start()
+
+    def subscribe(self, symbol, timeframe):
+        from .live import LiveStream
+
+        key = (symbol, timeframe)
+        with self._lock:
+            if key not in self.streams:
+                self.source.series(symbol, timeframe)  # valida símbolo e timeframe já na assinatura
+                self.streams[key] = LiveStream(symbol, timeframe)
+            return self.streams[key]
+
+    def unsubscribe(self, symbol, timeframe):
+        with self._lock:
+            self.streams.pop((symbol, timeframe), None)
+
+    def prune(self):
+        """Desassina os streams ociosos; devolve quantos saíram."""
+        if self.idle_timeout is None:
+            return 0
+        with self._lock:
+            idle = idle_streams(self.streams, self.idle_timeout)
+            for key in idle:
+                del self.streams[key]
+        return len(idle)
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def advance(self):
+        """Entrega os candles fechados até agora; devolve quantos foram entregues."""
+        now = self.source.clock.now_ms()
+        with self._lock:
+            streams = list(self.streams.values())
+        delivered = 0
+        for stream in streams:
+            with stream.lock:
+                last = stream.ring.last()
+            if last is None:
+                continue
+            rows = self.source.series(stream.symbol, stream.timeframe)
+            start = int(np.searchsorted(rows[:, 0], last[0], side='right'))
+            end = self.source.closed_count(stream.symbol, stream.timeframe, now)
+            for batch in range(start, end, REPLAY_BATCH):
+                stream.on_klines(rows[batch:min(batch + REPLAY_BATCH, end)].tolist())
+            delivered += max(0, end - start)
+        self.delivered += delivered
+        return delivered
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.advance()
+            self.prune()
@@ -0,0 +1,135 @@
+from collections import deque
+
+import numpy as np
+
+from .indicators import hilo_kernel, moving_average
+from .kernels import MA_MODES, REANCHOR_ROWS
+
+
+def _candle_fields(candle):
+    # aceita a linha crua do ccxt [ts, o, h, l, c, v] ou qualquer mapeamento
+    # com as chaves do DataFrame (dict, linha de DataFrame, ...)
+    if isinstance(candle, (list, tuple)):
+        return candle[0], candle[2], candle[3], candle[4]
+    return candle.get('timestamp'), candle['high'], candle['low'], candle['close']
+
+
+class HiloState:
+    """Estado incremental do Hilo Activator: O(1) em tempo e memória por candle.
+
+    Cada ``update`` produz o mesmo ``(hilo, position)`` que
+    ``hilo_activator_refactored`` daria para a última linha da série completa
+    (no modo ``sma`` a média vem de uma soma corrente e pode diferir da
+    versão vetorial no último dígito). Alimente apenas candles fechados.
+    ``hi_ema``/``lo_ema`` guardam a média do modo escolhido.
+    """
+
+    def __init__(self, period, shift=1, mode='ema'):
+        if mode not in MA_MODES:
+            raise ValueError(f"Média desconhecida: {mode} (use {', '.join(MA_MODES)})")
+        self.period = period
+        self.shift = shift
+        self.mode = mode
+        self.alpha = 1 / period if mode == 'wilder' else 2 / (period + 1)
+        self.beta = 1 - self.alpha
+        self.hi_ema = np.nan
+        self.lo_ema = np.nan
+        self.last_close = np.nan
+        self.last_timestamp = None
+        self.hilo = np.nan
+        self.position = 0
+        self.count = 0
+        # máximas/mínimas que ainda não entraram na EMA por causa do deslocamento
+        self._pending = deque(maxlen=shift) if shift else None
+        # janela e somas correntes do SMA (e da semente do Wilder)
+        self._window = deque(maxlen=period)
+        self._sums = [0.0, 0.0]
+
+    @classmethod
+    def from_history(cls, df, period, shift=1, mode='ema'):
+        state = cls(period, shift, mode)
+        n = len(df)
+        if n == 0:
+            return state
+
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        if n > shift:
+            state.hi_ema = moving_average(high[:n - shift], period, mode)[-1]
+            state.lo_ema = moving_average(low[:n - shift], period, mode)[-1]
+            fed = n - shift
+            if mode == 'sma' or (mode == 'wilder' and fed < period):
+                window = list(zip(high[max(fed - period, 0):fed].tolist(), low[max(fed - period, 0):fed].tolist()))
+                state._window.extend(window)
+                state._sums = [sum(h for h, _ in window), sum(l for _, l in window)]
+        if shift:
+            state._pending.extend(zip(high[max(n - shift, 0):].tolist(), low[max(n - shift, 0):].tolist()))
+
+        hilo, position = hilo_kernel(high, low, close, period, shift, mode)
+        if len(hilo):
+            state.hilo, state.position = hilo[-1], int(position[-1])
+        state.count = n
+        state.last_close = close[-1]
+        if 'timestamp' in df:
+            state.last_timestamp = df['timestamp'].iloc[-1]
+        return state
+
+    @property
+    def ready(self):
+        return self.count >= self.period + self.shift
+
+    def update(self, candle):
+        timestamp, high, low, close = _candle_fields(candle)
+        prev_hi = self.hi_ema
+
+        if self.shift:
+            if len(self._pending) == self.shift:
+                self._feed(*self._pending[0])
+            self._pending.append((float(high), float(low)))
+        else:
+            self._feed(float(high), float(low))
+
+        self._classify(float(close), prev_hi)
+        self.last_close = float(close)
+        self.last_timestamp = timestamp
+        self.count += 1
+        return self.hilo, self.position
+
+    def _feed(self, high, low):
+        fed = self.count - self.shift  # valores que já entraram na média
+        if self.mode == 'sma':
+            self._slide(high, low, fed)
+        elif self.mode == 'ema' and fed == 0:
+            self.hi_ema, self.lo_ema = high, low
+        elif self.mode == 'wilder' and fed < self.period:
+            # semente do Wilder: média simples dos ``period`` primeiros valores
+            self._sums[0] += high
+            self._sums[1] += low
+            if fed == self.period - 1:
+                self.hi_ema, self.lo_ema = self._sums[0] / self.period, self._sums[1] / self.period
+        else:
+            self.hi_ema = self.alpha * high + self.beta * self.hi_ema
+            self.lo_ema = self.alpha * low + self.beta * self.lo_ema
+
+    def _slide(self, high, low, fed):
+        if len(self._window) == self.period:
+            old_high, old_low = self._window[0]
+            self._sums[0] -= old_high
+            self._sums[1] -= old_low
+        self._window.append((high, low))
+        self._sums[0] += high
+        self._sums[1] += low
+        if (fed + 1) % REANCHOR_ROWS == 0:
+            # refaz as somas do zero para o arredondamento não se acumular
+            self._sums = [sum(h for h, _ in self._window), sum(l for _, l in self._window)]
+        if len(self._window) == self.period:
+            self.hi_ema, self.lo_ema = self._sums[0] / self.period, self._sums[1] / self.period
+
+    def _classify(self, close, prev_hi):
+        if self.count < self.period + self.shift - 1:
+            self.hilo, self.position = np.nan, 0
+            return
+        up = close > self.hi_ema or (not close < self.lo_ema and self.last_close > prev_hi)
+        self.hilo = self.lo_ema if up else self.hi_ema
+        self.position = -1 if up else 1
@@ -0,0 +1,189 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+DTYPES = {'timestamp': np.int64, 'open': np.float64, 'high': np.float64,
+          'low': np.float64, 'close': np.float64, 'volume': np.float64}
+DEFAULT_ROOT = os.environ.get('HILO_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'hilo'))
+
+
+def _safe(name):
+    return name.replace('/', '-').replace(':', '_')
+
+
+class CandleStore:
+    """Armazém colunar de candles em disco, um arquivo binário por coluna.
+
+    Cada chave (fonte, símbolo, timeframe) vira um diretório com
+    ``timestamp.bin`` (int64, ms) e ``open/high/low/close/volume.bin``
+    (float64). As gravações só anexam ao fim, sobrescrevendo apenas os
+    candles que se sobrepõem ao último armazenado. Leituras e gravações de uma
+    chave passam pelo lock dela, e as leituras copiam os dados do ``np.memmap``
+    antes de soltá-lo: um memmap vivo veria linhas pela metade ou a cauda
+    truncada por ``append`` (SIGBUS).
+    """
+
+    def __init__(self, root=None):
+        self.root = os.path.join(root or DEFAULT_ROOT, 'candles')
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _dir(self, key):
+        exchange_id, symbol, timeframe = key
+        return os.path.join(self.root, _safe(exchange_id), _safe(symbol), timeframe)
+
+    def _path(self, key, column):
+        return os.path.join(self._dir(key), f'{column}.bin')
+
+    def lock(self, key):
+        with self._locks_guard:
+            # reentrante: ``prepend`` e ``replace`` leem e gravam sob o mesmo lock
+            return self._locks.setdefault(key, threading.RLock())
+
+    def count(self, key):
+        with self.lock(key):
+            return self._count(key)
+
+    def _count(self, key):
+        # uma gravação interrompida pode deixar colunas com tamanhos diferentes
+        sizes = []
+        for column in COLUMNS:
+            path = self._path(key, column)
+            if not os.path.exists(path):
+                return 0
+            sizes.append(os.path.getsize(path) // 8)
+        return min(sizes)
+
+    def columns(self, key, start=None, stop=None, price_dtype=np.float64):
+        """Fatia ``[start:stop]`` das colunas, copiada do memmap sob o lock da chave.
+
+        Os preços saem já em ``price_dtype``, sem cópia float64 no meio.
+        """
+        with self.lock(key):
+            n = self._count(key)
+            out = {}
+            for column in COLUMNS:
+                dtype = DTYPES[column] if column == 'timestamp' else price_dtype
+                if n == 0:
+                    out[column] = np.empty(0, dtype=dtype)
+                else:
+                    stored = np.memmap(self._path(key, column), dtype=DTYPES[column], mode='r', shape=(n,))
+                    out[column] = np.array(stored[start:stop], dtype=dtype)
+                    del stored
+            return out
+
+    def _timestamp_at(self, key, index):
+        with self.lock(key):
+            n = self._count(key)
+            if n == 0:
+                return None
+            stored = np.memmap(self._path(key, 'timestamp'), dtype=np.int64, mode='r', shape=(n,))
+            return int(stored[index])
+
+    def last_timestamp(self, key):
+        return self._timestamp_at(key, -1)
+
+    def first_timestamp(self, key):
+        return self._timestamp_at(key, 0)
+
+    def load(self, key, limit=None):
+        start = -limit if limit else None
+        df = pd.DataFrame(self.columns(key, start), columns=list(COLUMNS))
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+    def candles(self, key, limit=None, dtype=np.float32):
+        """Os últimos ``limit`` candles como ``Candles``, convertidos direto do memmap."""
+        from .candles import Candles
+
+        columns = self.columns(key, -limit if limit else None, price_dtype=dtype)
+        return Candles(*(columns[column] for column in COLUMNS), dtype=dtype)
+
+    def append(self, key, ohlcv):
+        """Anexa linhas cruas do ccxt; candles com timestamp já armazenado são substituídos."""
+        if not len(ohlcv):
+            return 0
+        rows = np.asarray(ohlcv, dtype=np.float64)
+        new_ts = rows[:, 0].astype(np.int64)
+        with self.lock(key):
+            os.makedirs(self._dir(key), exist_ok=True)
+            n = self._count(key)
+            keep = n
+            if n:
+                stored_ts = np.memmap(self._path(key, 'timestamp'), dtype=np.int64, mode='r', shape=(n,))
+                keep = int(np.searchsorted(stored_ts, new_ts[0]))
+                del stored_ts
+            for i, column in enumerate(COLUMNS):
+                values = new_ts if column == 'timestamp' else rows[:, i]
+                with open(self._path(key, column), 'ab') as f:
+                    f.truncate(keep * 8)
+                    f.write(np.ascontiguousarray(values, dtype=DTYPES[column]).tobytes())
+        return len(rows)
+
+    def prepend(self, key, ohlcv):
+        """Insere linhas cruas do ccxt mais antigas que o primeiro candle armazenado.
+
+        Ao contrário de ``append``, reescreve as colunas inteiras: cada uma é
+        gravada num arquivo temporário e só então troca de lugar com a atual.
+        """
+        if not len(ohlcv):
+            return 0
+        rows = np.asarray(ohlcv, dtype=np.float64)
+        with self.lock(key):
+            os.makedirs(self._dir(key), exist_ok=True)
+            stored = self.columns(key)
+            if len(stored['timestamp']):
+                rows = rows[rows[:, 0] < stored['timestamp'][0]]
+            if not len(rows):
+                return 0
+            self._swap(key, rows, stored)
+        return len(rows)
+
+    def _swap(self, key, rows, tail=None):
+        # grava ``rows`` (+ ``tail``, colunas já armazenadas) em temporários e troca
+        # todas as colunas de uma vez; chamado sob o lock da chave
+        for i, column in enumerate(COLUMNS):
+            values = rows[:, 0].astype(np.int64) if column == 'timestamp' else rows[:, i]
+            with open(self._path(key, column) + '.tmp', 'wb') as f:
+                f.write(np.ascontiguousarray(values, dtype=DTYPES[column]).tobytes())
+                if tail is not None:
+                    f.write(np.ascontiguousarray(tail[column]).tobytes())
+        for column in COLUMNS:
+            os.replace(self._path(key, column) + '.tmp', self._path(key, column))
+
+    def listing_start_reached(self, key):
+        """Se o primeiro candle armazenado já é o início da listagem no exchange."""
+        return os.path.exists(os.path.join(self._dir(key), 'listing_start'))
+
+    def mark_listing_start(self, key):
+        """Registra que não há candles anteriores ao primeiro armazenado."""
+        with self.lock(key):
+            os.makedirs(self._dir(key), exist_ok=True)
+            with open(os.path.join(self._dir(key), 'listing_start'), 'w') as f:
+                f.write(str(self.first_timestamp(key)))
+
+    def replace(self, key, ohlcv):
+        """Troca o histórico da chave por ``ohlcv`` numa única operação sob o lock."""
+        rows = np.asarray(ohlcv, dtype=np.float64).reshape(-1, len(COLUMNS))
+        with self.lock(key):
+            if not len(rows):
+                self._clear(key)
+                return 0
+            os.makedirs(self._dir(key), exist_ok=True)
+            listing_start = os.path.join(self._dir(key), 'listing_start')
+            if os.path.exists(listing_start):
+                os.remove(listing_start)
+            self._swap(key, rows)
+        return len(rows)
+
+    def clear(self, key):
+        with self.lock(key):
+            self._clear(key)
+
+    def _clear(self, key):
+        for path in [self._path(key, column) for column in COLUMNS] + [os.path.join(self._dir(key), 'listing_start')]:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,112 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .kernels import ema_2d, moving_average_2d
+
+DEFAULT_PERIODS = range(2, 101)
+DEFAULT_SHIFTS = range(0, 11)
+BLOCK_ROWS = 8192
+
+
+def ema_matrix(data, periods):
+    """EMA de ``data`` para vários períodos de uma vez, matriz ``(n, len(periods))``.
+
+    Cada coluna é igual bit a bit a ``ema(data, period)``: a recorrência
+    continua sequencial no tempo, compilada quando há numba e, sem ele, com
+    cada passo atualizando todos os períodos numa única operação vetorial.
+    """
+    return ema_2d(data, periods)
+
+
+def _shifted_rows(matrix, shift, t0, t1):
+    # linhas t0..t1-1 da matriz deslocada ``shift`` barras para frente (NaN fora dela)
+    src = np.arange(t0, t1) - shift
+    rows = np.full((t1 - t0, matrix.shape[1]), np.nan)
+    ok = src >= 0
+    rows[ok] = matrix[src[ok]]
+    return rows
+
+
+def sweep_hilo(high, low, close, periods=DEFAULT_PERIODS, shifts=DEFAULT_SHIFTS, mode='ema'):
+    """Avalia o Hilo em toda a grade ``periods`` × ``shifts`` de um ativo.
+
+    As matrizes de EMA são calculadas uma vez por alpha; cada deslocamento é
+    só um deslocamento de linhas dessas matrizes. As posições são as mesmas de
+    ``hilo_activator_refactored`` e são processadas em blocos de linhas para
+    limitar a memória. Devolve ``flips`` e ``pnl`` (soma dos retornos log do
+    sinal, comprado em -1 e vendido em 1) com forma ``(len(periods), len(shifts))``.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    periods = np.asarray(periods)
+    n = len(close)
+
+    hi_ema = moving_average_2d(high, periods, mode)
+    lo_ema = moving_average_2d(low, periods, mode)
+    log_ret = np.diff(np.log(close))
+
+    flips = np.zeros((len(periods), len(shifts)), dtype=np.int64)
+    pnl = np.zeros((len(periods), len(shifts)), dtype=np.float64)
+    close_prev = np.concatenate([[np.nan], close[:-1]])
+    for j, shift in enumerate(shifts):
+        warmup = periods + shift - 1
+        last_pos = np.zeros(len(periods), dtype=np.int8)
+        for a in range(0, n, BLOCK_ROWS):
+            b = min(a + BLOCK_ROWS, n)
+            # uma linha a mais no início: a média anterior decide o empate
+            hi = _shifted_rows(hi_ema, shift, a - 1, b)
+            lo = _shifted_rows(lo_ema, shift, a, b)
+            c = close[a:b, None]
+            prev_up = close_prev[a:b, None] > hi[:-1]
+            up = (c > hi[1:]) | (~(c < lo) & prev_up)
+            valid = np.arange(a, b)[:, None] >= warmup[None, :]
+            pos = np.where(valid, np.where(up, -1, 1), 0).astype(np.int8)
+
+            before = np.vstack([last_pos, pos[:-1]])
+            flips[:, j] += ((pos != before) & (before != 0)).sum(axis=0)
+            m = min(b, n - 1) - a
+            if m > 0:
+                pnl[:, j] -= (pos[:m] * log_ret[a:a + m, None]).sum(axis=0)
+            last_pos = pos[-1]
+    return {'flips': flips, 'pnl': pnl}
+
+
+def _sweep_frame(args):
+    ticker, high, low, close, periods, shifts, mode = args
+    result = sweep_hilo(high, low, close, periods, shifts, mode)
+    grid_p, grid_s = np.meshgrid(periods, shifts, indexing='ij')
+    return pd.DataFrame({
+        'ticker': ticker,
+        'period': grid_p.ravel(),
+        'shift': grid_s.ravel(),
+        'flips': result['flips'].ravel(),
+        'pnl': result['pnl'].ravel(),
+    })
+
+
+def sweep_assets(frames, periods=DEFAULT_PERIODS, shifts=DEFAULT_SHIFTS, max_workers=None, mode='ema'):
+    """Varre a grade para cada ativo de ``frames`` (``{ticker: df}``), um processo por ativo."""
+    periods, shifts = list(periods), list(shifts)
+    jobs = [(ticker, df['high'].values, df['low'].values, df['close'].values, periods, shifts, mode)
+            for ticker, df in frames.items()]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_sweep_frame, jobs))
+    if not results:
+        return pd.DataFrame(columns=['ticker', 'period', 'shift', 'flips', 'pnl'])
+    return pd.concat(results, ignore_index=True)
+
+
+def best_parameters(results, assets=None):
+    """Melhor ``(period, shift)`` por ativo pelo P&L do sinal, com o período atual ao lado."""
+    best = results.loc[results.groupby('ticker')['pnl'].idxmax()].reset_index(drop=True)
+    if assets:
+        # ativos fora da tabela continuam no resultado, com ``current_period`` vazio
+        current = pd.DataFrame(assets).rename(columns={'period': 'current_period'})
+        best = best.merge(current, on='ticker', how='left')
+        for column in current.select_dtypes('integer'):
+            best[column] = best[column].astype('Int64')
+        best = best[list(current.columns) + [c for c in best.columns if c not in current.columns]]
+    return best
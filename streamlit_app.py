@@ -1,114 +1,138 @@
-import ccxt
+import os
+import time
+
 import pandas as pd
-import numpy as np
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+from hilo import (
+    CandleStore,
+    Candles,
+    ExchangeSource,
+    IndicatorCache,
+    MarketCatalog,
+    RefreshingCache,
+    MultiTimeframeLoader,
+    ReplaySource,
+    SharedExchange,
+    assets,
+    backtest_positions,
+    backtest_summary,
+    scan_assets,
+    summarize_hilo,
+)
+from hilo.data import PAGE_LIMIT
+from hilo.metrics import append_log, metrics, start_http_server
+from hilo.sources import REPLAY_SPEED
+
+TIMEFRAMES = ["1d", "4h", "1h", "15m", "5m"]
+REPLAY_REFRESH = 2
 
 st.set_page_config(page_title="Gráfico de Velas com Hilo Activator Stairs (Testnet)", layout="wide")
 st.title("Gráfico de Velas com Hilo Activator Stairs (Testnet)")
 
-# Lista de ativos com períodos específicos
-assets = [
-    {"id": 1, "ticker": "BTC/USDT", "period": 40},
-    {"id": 2, "ticker": "ETH/USDT", "period": 23},
-    {"id": 3, "ticker": "ADA/USDT", "period": 43},
-    {"id": 4, "ticker": "NEO/USDT", "period": 30},
-    {"id": 5, "ticker": "LINK/USDT", "period": 31},
-    {"id": 6, "ticker": "MANA/USDT", "period": 52},
-    {"id": 7, "ticker": "SUSHI/USDT", "period": 40},
-    {"id": 8, "ticker": "ATOM/USDT", "period": 20},
-    {"id": 9, "ticker": "FTM/USDT", "period": 52},
-    {"id": 12, "ticker": "XRP/USDT", "period": 40},
-    {"id": 13, "ticker": "SOL/USDT", "period": 38},
-    {"id": 14, "ticker": "DOGE/USDT", "period": 42},
-    {"id": 15, "ticker": "BNB/USDT", "period": 50},
-    {"id": 16, "ticker": "LTC/USDT", "period": 33},
-    {"id": 17, "ticker": "DOT/USDT", "period": 37},
-    {"id": 18, "ticker": "AVAX/USDT", "period": 46},
-    {"id": 20, "ticker": "MATIC/USDT", "period": 29},
-    {"id": 21, "ticker": "AXS/USDT", "period": 32},
-    {"id": 22, "ticker": "ALGO/USDT", "period": 27},
-    {"id": 23, "ticker": "AAVE/USDT", "period": 35},
-    {"id": 24, "ticker": "UNI/USDT", "period": 39},
-    {"id": 25, "ticker": "FIL/USDT", "period": 34},
-    {"id": 26, "ticker": "SAND/USDT", "period": 28},
-    {"id": 27, "ticker": "CRV/USDT", "period": 41},
-    {"id": 28, "ticker": "FTT/USDT", "period": 36},
-    {"id": 29, "ticker": "VET/USDT", "period": 30},
-    {"id": 30, "ticker": "THETA/USDT", "period": 31},
-    {"id": 31, "ticker": "GALA/USDT", "period": 43}
-]
-
-@st.cache_data(ttl=3600)
+
+# Armazém local de candles: sobrevive a reinícios e evita rebaixar a janela inteira
+@st.cache_resource
+def get_candle_store():
+    return CandleStore()
+
+# Cliente único da exchange para todo o processo (sessão HTTP, mercados e limite de taxa)
+@st.cache_resource
+def get_shared_exchange():
+    return SharedExchange()
+
+# Fonte dos candles: a exchange ou, com HILO_REPLAY, um arquivo reproduzido HILO_REPLAY_SPEED vezes mais rápido
+@st.cache_resource
+def get_data_source():
+    path = os.environ.get('HILO_REPLAY')
+    if path:
+        return ReplaySource(path, speed=float(os.environ.get('HILO_REPLAY_SPEED', REPLAY_SPEED)))
+    return ExchangeSource(get_shared_exchange(), get_candle_store())
+
+# Mercados da fonte guardados em disco (só os da exchange): ativos sem mercado são marcados antes de qualquer busca
+@st.cache_resource
+def get_market_catalog():
+    source = get_data_source()
+    return MarketCatalog(source.load_markets, name=source.name, persist=source.remote)
+
+# Candles (float32) servidos na hora mesmo depois de vencidos; a atualização roda em segundo plano
+@st.cache_resource
+def get_data_cache():
+    def fetch(symbol, timeframe, limit):
+        candles = get_data_source().fetch_candles(symbol, timeframe, limit)
+        if candles.empty:
+            raise ValueError("a exchange não devolveu candles")
+        return candles
+    return RefreshingCache(fetch, ttl=3600)
+
+# Resultado do cache de cada busca desta execução ("hit", "stale", "miss", "local" no replay ou "erro");
+# fica na sessão porque o carregador de timeframes, compartilhado, também chama esta função
 def get_binance_testnet_data(symbol, timeframe, limit):
-    exchange = ccxt.binance({
-        'enableRateLimit': True,
-        'options': {
-            'defaultType': 'future'
-        }
-    })
-    exchange.set_sandbox_mode(True)
+    results = st.session_state.setdefault('data_cache_results', [])
     try:
-        ohlcv = exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-        if not ohlcv:
-            raise ValueError(f"Nenhum dado disponível para {symbol}")
-        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        return df
+        # fontes locais (replay) são lidas direto: o cache existe para poupar a rede
+        if not get_data_source().remote:
+            results.append('local')
+            return get_data_source().fetch_candles(symbol, timeframe, limit)
+        candles, result = get_data_cache().lookup(symbol, timeframe, limit)
+        results.append(result)
+        return candles
     except Exception as e:
+        results.append('erro')
         st.error(f"Erro ao obter dados para {symbol}: {str(e)}")
-        return pd.DataFrame()
-
-def ema(data, period):
-    alpha = 2 / (period + 1)
-    ema_values = [data[0]]  # Initialize with first value
-    for i in range(1, len(data)):
-        ema_values.append(alpha * data[i] + (1 - alpha) * ema_values[-1])
-    return ema_values
-
-def hilo_activator_refactored(df, period, shift=1):
-    if len(df) < period + shift:
-        return pd.Series(dtype=float), pd.Series(dtype=int)
-
-    high_prices = df['high'].values
-    low_prices = df['low'].values
-    close_prices = df['close'].values
-
-    shifted_high = high_prices[:-shift]
-    shifted_low = low_prices[:-shift]
-
-    hi_ema = ema(shifted_high, period)
-    lo_ema = ema(shifted_low, period)
-
-    hi_ema = [np.nan] * (len(df) - len(hi_ema)) + hi_ema
-    lo_ema = [np.nan] * (len(df) - len(lo_ema)) + lo_ema
-
-    hilo = []
-    position = []
-
-    for i in range(len(df)):
-        if i < period + shift - 1:
-            hilo.append(np.nan)
-            position.append(0)
-        else:
-            current_close = close_prices[i]
-            previous_close = close_prices[i-1]
-
-            if current_close > hi_ema[i]:
-                hilo_value = lo_ema[i]
-                pos = -1  # Up trend
-            elif current_close < lo_ema[i]:
-                hilo_value = hi_ema[i]
-                pos = 1   # Down trend
-            else:
-                hilo_value = lo_ema[i] if previous_close > hi_ema[i-1] else hi_ema[i]
-                pos = -1 if previous_close > hi_ema[i-1] else 1
-
-            hilo.append(hilo_value)
-            position.append(pos)
-
-    return pd.Series(hilo, name='hilo'), pd.Series(position, name='position')
+        return Candles.from_ohlcv([])
+
+# Métricas exportadas: /metrics no formato do Prometheus e/ou um log JSON por execução
+@st.cache_resource
+def start_metrics_exporter():
+    port = os.environ.get('HILO_METRICS_PORT')
+    return start_http_server(metrics, int(port)) if port else None
+
+start_metrics_exporter()
+METRICS_LOG = os.environ.get('HILO_METRICS_LOG')
+
+# Resultados do Hilo por (ativo, timeframe, período, deslocamento, média, versão dos dados)
+@st.cache_resource
+def get_indicator_cache():
+    return IndicatorCache()
+
+@st.cache_resource
+def get_timeframe_loader():
+    # sem TTL próprio: a validade dos dados é decidida pelo cache de candles
+    # fontes locais não paginam: derivar sempre compensa
+    source = get_data_source()
+    return MultiTimeframeLoader(get_binance_testnet_data, base_timeframe=source.base_timeframe, ttl=0,
+                                page_size=PAGE_LIMIT if source.remote else None)
+
+@st.cache_data(ttl=300)
+def scan_all_assets(timeframe, limit, shift, mode):
+    return scan_assets(None, assets, timeframe, limit, shift, mode=mode, fetch=get_data_source().fetch,
+                       catalog=get_market_catalog())
+
+# Assinante de klines compartilhado por todas as sessões (WebSocket da exchange ou o relógio do replay)
+@st.cache_resource
+def get_live_feed():
+    return get_data_source().live_feed()
+
+# Atualiza só o painel ao vivo a cada segundo, com o candle mais recente
+@st.fragment(run_every="1s")
+def live_panel(stream, period, shift, mode):
+    snapshot = stream.snapshot(period, shift, mode)
+    if snapshot['candle'] is None:
+        st.info("Aguardando dados do WebSocket...")
+        return
+    col1, col2, col3, col4 = st.columns(4)
+    price = get_market_catalog().format_price
+    col1.metric("Último preço" + ("" if snapshot['closed'] else " (em formação)"), price(stream.symbol, snapshot['candle'][4]))
+    col2.metric("Hilo (último candle fechado)", price(stream.symbol, snapshot['hilo']))
+    col3.metric("Posição", {-1: "Alta", 1: "Baixa"}.get(snapshot['position'], "-"))
+    col4.metric("Latência", "-" if snapshot['latency'] is None else f"{snapshot['latency'] * 1000:.0f} ms")
+
+# No replay, mostra de onde vêm os candles e onde está o relógio simulado
+if not get_data_source().remote:
+    replay = get_data_source().progress()
+    st.caption(f"Replay de {get_data_source().path} a {replay['speed']:g}×; relógio em {replay['clock']:%d/%m/%Y %H:%M}"
+               + (" (fim do arquivo)" if replay['finished'] else ""))
 
 st.sidebar.header("Configurações")
 
@@ -121,10 +145,12 @@ def update_period():
     selected_asset_info = next(asset for asset in assets if asset['ticker'] == st.session_state.selected_asset)
     st.session_state.selected_period = selected_asset_info['period']
 
-# Seleção do ativo com callback para atualizar o período
+# Seleção do ativo com callback para atualizar o período; ativos sem mercado na Testnet ficam marcados
+invalid_assets = get_market_catalog().invalid(assets)
 selected_asset = st.sidebar.selectbox(
     "Selecione o ativo",
     [asset['ticker'] for asset in assets],
+    format_func=lambda ticker: f"{ticker} (indisponível)" if ticker in invalid_assets else ticker,
     key='selected_asset',
     on_change=update_period
 )
@@ -138,46 +164,111 @@ period = st.sidebar.slider(
     key='period_slider'
 )
 
-timeframe = st.sidebar.selectbox("Timeframe", ["1d", "4h", "1h", "15m", "5m"], index=0)
-limit = st.sidebar.slider("Número de candles", min_value=50, max_value=1000, value=120)
+timeframe = st.sidebar.selectbox("Timeframe", TIMEFRAMES, index=0)
+limit = st.sidebar.slider("Número de candles", min_value=50, max_value=20000, value=120, step=10)
 shift = st.sidebar.slider("Deslocamento do Hilo Activator", min_value=0, max_value=10, value=1)
+# SMA é a média usada pela maioria das outras plataformas; Wilder é a RMA
+MA_LABELS = {'ema': "Exponencial (EMA)", 'sma': "Simples (SMA)", 'wilder': "Wilder (RMA)"}
+mode = st.sidebar.selectbox("Média do Hilo Activator", list(MA_LABELS), format_func=MA_LABELS.get)
+
+derive_timeframes = st.sidebar.checkbox(f"Derivar timeframes dos candles de {get_data_source().base_timeframe}",
+                                        value=True)
+follow_replay = not get_data_source().remote and st.sidebar.checkbox(
+    f"Acompanhar o replay (redesenha a cada {REPLAY_REFRESH} s)")
+
+# Tempos de cada etapa desta execução, mostrados em "Depuração"
+run_timings = {}
+st.session_state['data_cache_results'] = []
+
+# Timeframes saem do mesmo histórico de 5m quando isso não custa mais requisições que a busca direta
+timeframe_loader = get_timeframe_loader()
+derived = derive_timeframes and timeframe_loader.supports(timeframe, limit, selected_asset)
+with metrics.timer('fetch', run_timings):
+    if selected_asset in invalid_assets:
+        candles = Candles.from_ohlcv([])
+    else:
+        if derived:
+            candles = timeframe_loader.load(selected_asset, timeframe, limit)
+            # histórico de 5m mais curto que o pedido: o timeframe direto vai mais longe
+            derived = len(candles) >= limit
+        if not derived:
+            candles = get_binance_testnet_data(selected_asset, timeframe, limit)
+# a pior das buscas desta execução; "-" quando nenhuma foi feita (ativo indisponível)
+data_cache_result = next((result for result in ('erro', 'miss', 'stale', 'hit', 'local')
+                          if result in st.session_state['data_cache_results']), '-')
+
+# Dados vencidos ou com erro na última atualização ficam sinalizados acima do gráfico
+if derived:
+    data_key = timeframe_loader.base_request(selected_asset) or (selected_asset, timeframe, limit)
+else:
+    data_key = (selected_asset, timeframe, limit)
+data_status = get_data_cache().status(*data_key)
+if not candles.empty and (data_status['stale'] or data_status['error']):
+    notice = f"Dados de {time.strftime('%d/%m %H:%M:%S', time.localtime(data_status['fetched_at']))} (desatualizados)"
+    if data_status['refreshing']:
+        notice += "; atualizando em segundo plano"
+    if data_status['error']:
+        notice += f". Última falha: {data_status['error']}"
+    if data_status['circuit'] == 'open':
+        notice += f". Nova tentativa na exchange em {data_status['retry_in']:.0f} s"
+    st.warning(notice)
+
+if not candles.empty:
+    # Candles compactos; hilo, posição e largura são derivados e só viram colunas na exibição
+    indicator_hits_before = get_indicator_cache().hits
+    with metrics.timer('indicator', run_timings):
+        hilo, position = get_indicator_cache().hilo(selected_asset, timeframe, candles, period, shift, mode)
+    indicator_cache_hit = get_indicator_cache().hits > indicator_hits_before
+    with metrics.timer('frame_build', run_timings):
+        df = candles.to_frame(hilo=hilo, position=position, candle_width=candles.candle_width())
+
+    # Acompanhamento ao vivo via WebSocket (ou pelo replay), sem novas chamadas a fetch_ohlcv
+    if st.sidebar.checkbox("Ao vivo (WebSocket)" if get_data_source().remote else "Ao vivo (replay)"):
+        stream = get_live_feed().subscribe(selected_asset, timeframe)
+        # o último candle do REST normalmente ainda está em formação
+        stream.seed(df.iloc[:-1], period, shift, mode)
+        live_panel(stream, period, shift, mode)
+
+    # plotly só é carregado quando há candles para desenhar (o import fica em cache nos reruns)
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    from hilo.charts import MAX_POINTS, decimate_candles, hilo_stairs_traces, volume_trace
+
+    # Janelas grandes: agrega a faixa visível em baldes OHLC e usa traços WebGL
+    large_mode = st.sidebar.checkbox("Modo para muitos candles (WebGL)", value=len(df) > MAX_POINTS)
+    plot_df = df
+    if large_mode:
+        first_ts = df['timestamp'].iloc[0].to_pydatetime()
+        last_ts = df['timestamp'].iloc[-1].to_pydatetime()
+        visible_range = st.sidebar.slider("Janela visível", min_value=first_ts, max_value=last_ts,
+                                          value=(first_ts, last_ts), format="DD/MM/YY HH:mm")
+        plot_df = decimate_candles(df, MAX_POINTS, visible_range)
 
-df = get_binance_testnet_data(selected_asset, timeframe, limit)
-
-if not df.empty:
-    df['hilo'], df['position'] = hilo_activator_refactored(df, period, shift)
-
-    df['timestamp_diff'] = df['timestamp'].diff().dt.total_seconds()
-    default_width = df['timestamp_diff'].median() * 0.8
-    df['candle_width'] = df['timestamp_diff'].fillna(default_width) * 0.8
+    # Adicionando caixa de depuração
+    st.sidebar.header("Depuração")
+    show_timings = st.sidebar.checkbox("Mostrar tempos por etapa")
+    timings_box = st.sidebar.container()
 
+    figure_start = time.perf_counter()
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.03, row_heights=[0.7, 0.3])
 
-    fig.add_trace(go.Candlestick(x=df['timestamp'],
-                                 open=df['open'],
-                                 high=df['high'],
-                                 low=df['low'],
-                                 close=df['close'],
+    fig.add_trace(go.Candlestick(x=plot_df['timestamp'],
+                                 open=plot_df['open'],
+                                 high=plot_df['high'],
+                                 low=plot_df['low'],
+                                 close=plot_df['close'],
                                  name='OHLC'),
                   row=1, col=1)
 
-    for i in range(len(df)):
-        if pd.notna(df['hilo'].iloc[i]) and pd.notna(df['candle_width'].iloc[i]):
-            y_position = df['hilo'].iloc[i]
-            color = "red" if df['position'].iloc[i] == 1 else "green"
-            half_width = pd.Timedelta(seconds=df['candle_width'].iloc[i]/2)
-            fig.add_shape(type="line",
-                      x0=df['timestamp'].iloc[i] - half_width,
-                      x1=df['timestamp'].iloc[i] + half_width,
-                      y0=y_position, y1=y_position,
-                      line=dict(color=color, width=2),
-                      row=1, col=1)
-
-    fig.add_trace(go.Bar(x=df['timestamp'], y=df['volume'], name='Volume', marker_color='rgba(0,0,0,0.5)'),
+    for trace in hilo_stairs_traces(plot_df['timestamp'], plot_df['candle_width'], plot_df['hilo'], plot_df['position'],
+                                    webgl=large_mode):
+        fig.add_trace(trace, row=1, col=1)
+
+    fig.add_trace(volume_trace(plot_df['timestamp'], plot_df['volume'], webgl=large_mode),
                   row=2, col=1)
 
     fig.update_layout(
-        title=f'{selected_asset} - Gráfico de Velas com Hilo Activator Stairs (Período: {period})',
+        title=f'{selected_asset} - Gráfico de Velas com Hilo Activator Stairs (Período: {period}, {MA_LABELS[mode]})',
         yaxis_title='Preço',
         xaxis_rangeslider_visible=False,
         height=800,
@@ -185,11 +276,31 @@ if not df.empty:
     )
 
     fig.update_yaxes(title_text="Volume", row=2, col=1)
+    market = get_market_catalog().get(selected_asset)
+    if market and market['price_decimals'] is not None:
+        fig.update_yaxes(tickformat=f".{market['price_decimals']}f", row=1, col=1)
+    metrics.observe('figure_build', time.perf_counter() - figure_start, run_timings)
+
+    # o tamanho do payload exige serializar a figura mais uma vez, então só é medido com o painel aberto
+    payload_bytes = None
+    if show_timings:
+        payload_bytes = len(fig.to_json().encode())
+        metrics.gauge('chart_payload_bytes', payload_bytes)
+    with metrics.timer('chart_serialize', run_timings):
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Backtest das viradas de posição do Hilo (comprado em alta, vendido em baixa)
+    if st.checkbox("Mostrar backtest do sinal"):
+        result = backtest_positions(df['close'].values, df['position'].values, df['timestamp'].values)
+        summary = backtest_summary(result)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Retorno total", f"{summary['total_return']:.2%}")
+        col2.metric("Drawdown máximo", f"{summary['max_drawdown']:.2%}")
+        col3.metric("Operações", summary['trades'])
+        col4.metric("Taxa de acerto", f"{summary['win_rate']:.1%}")
+        st.line_chart(result['equity'])
+        st.dataframe(result['trades'], use_container_width=True)
 
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Adicionando caixa de depuração
-    st.sidebar.header("Depuração")
     if st.sidebar.checkbox("Mostrar valores do Hilo Activator"):
         st.sidebar.subheader("Últimos 10 valores do Hilo Activator")
         st.sidebar.dataframe(df[['timestamp', 'close', 'hilo', 'position']].tail(10))
@@ -199,7 +310,84 @@ if not df.empty:
         hilo_stats = df['hilo'].describe()
         st.sidebar.write(hilo_stats)
 
+    if st.sidebar.checkbox("Mostrar uso do cliente da exchange e dos caches"):
+        st.sidebar.subheader("Cliente da exchange")
+        st.sidebar.write(get_shared_exchange().stats())
+        st.sidebar.subheader("Mercados")
+        catalog = get_market_catalog()
+        st.sidebar.write({'mercados': len(catalog.records()), 'indisponíveis': sorted(invalid_assets),
+                          'carregados em': None if catalog.saved_at is None else time.ctime(catalog.saved_at)})
+        st.sidebar.subheader("Cache de candles")
+        st.sidebar.write({**get_data_cache().stats(), 'selecionado': data_status})
+        st.sidebar.subheader("Cache de indicadores")
+        st.sidebar.write(get_indicator_cache().stats())
+        if not get_data_source().remote:
+            st.sidebar.subheader("Replay")
+            st.sidebar.write(get_data_source().progress())
+
+    if derive_timeframes and st.checkbox("Comparar Hilo em vários timeframes"):
+        rows = []
+        for tf in TIMEFRAMES:
+            if timeframe_loader.supports(tf, limit, selected_asset):
+                tf_df = timeframe_loader.load(selected_asset, tf, limit).to_frame()
+                rows.append({'timeframe': tf, **summarize_hilo(selected_asset, period, tf_df, shift, mode)})
+        comparison = pd.DataFrame(rows)
+        comparison['position'] = comparison['position'].map({-1: "Alta", 1: "Baixa", 0: "-"})
+        st.dataframe(comparison[['timeframe', 'close', 'hilo', 'position', 'distance_pct', 'bars_since_flip']].rename(columns={
+            'timeframe': "Timeframe",
+            'close': "Fechamento",
+            'hilo': "Hilo",
+            'position': "Posição",
+            'distance_pct': "Distância do Hilo (%)",
+            'bars_since_flip': "Barras desde a virada",
+        }), use_container_width=True)
+
     if st.checkbox("Mostrar dados brutos"):
         st.write(df)
+
+    run_record = {
+        'ticker': selected_asset,
+        'timeframe': timeframe,
+        'candles': len(df),
+        'data_cache': data_cache_result,
+        'indicator_cache': "hit" if indicator_cache_hit else "miss",
+        'payload_bytes': payload_bytes,
+        **{f'{stage}_ms': seconds * 1000 for stage, seconds in run_timings.items()},
+    }
+    if show_timings:
+        timings_box.dataframe(pd.DataFrame({
+            "Etapa": list(run_timings),
+            "Tempo (ms)": [seconds * 1000 for seconds in run_timings.values()],
+        }), hide_index=True)
+        timings_box.write({
+            "Cache de dados": run_record['data_cache'],
+            "Cache de indicadores": run_record['indicator_cache'],
+            "Payload do gráfico (bytes)": payload_bytes,
+        })
+    if METRICS_LOG:
+        append_log(METRICS_LOG, {'time': time.time(), **run_record})
+elif selected_asset in invalid_assets:
+    st.warning(f"{selected_asset} não tem mercado de futuros na Testnet. Escolha outro ativo.")
 else:
-    st.warning("Não foi possível obter dados para o ativo selecionado na Testnet. Por favor, tente outro ativo ou verifique a disponibilidade de dados na Testnet.")
\ No newline at end of file
+    st.warning("Não foi possível obter dados para o ativo selecionado na Testnet. Por favor, tente outro ativo ou verifique a disponibilidade de dados na Testnet.")
+
+# Scanner com o Hilo de todos os ativos, cada um com o seu período configurado
+if st.sidebar.checkbox("Mostrar scanner de todos os ativos"):
+    st.subheader(f"Scanner de ativos ({timeframe})")
+    scan = scan_all_assets(timeframe, limit, shift, mode)
+    scan['position'] = scan['position'].map({-1: "Alta", 1: "Baixa", 0: "-"})
+    st.dataframe(scan.rename(columns={
+        'ticker': "Ativo",
+        'period': "Período",
+        'close': "Fechamento",
+        'hilo': "Hilo",
+        'position': "Posição",
+        'distance_pct': "Distância do Hilo (%)",
+        'bars_since_flip': "Barras desde a virada",
+        'error': "Erro",
+    }), use_container_width=True)
+
+# Replay acompanhado: a página inteira é refeita com os candles liberados desde a última execução
+if follow_replay:
+    time.sleep(REPLAY_REFRESH)
+    st.rerun()